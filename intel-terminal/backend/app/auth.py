@@ -1,12 +1,17 @@
 """Authentication and JWT token management for Phase 2."""
 
+import asyncio
+import hashlib
 import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 import jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthCredentials
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -17,6 +22,15 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours
 
+# bcrypt runs in a bounded thread pool (the C extension releases the GIL);
+# at most AUTH_HASH_CONCURRENCY hashes are queued or running at once
+AUTH_HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", 2))
+AUTH_HASH_CONCURRENCY = int(os.getenv("AUTH_HASH_CONCURRENCY", 8))
+
+# Verified tokens are cached (by SHA256 of the token) for a short TTL
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", 10000))
+AUTH_TOKEN_CACHE_TTL = float(os.getenv("AUTH_TOKEN_CACHE_TTL", 60))
+
 
 def hash_password(password: str) -> str:
     """Hash a password for secure storage."""
@@ -28,6 +42,80 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_hash_semaphore: Optional[asyncio.Semaphore] = None
+
+
+async def _run_bcrypt(func, *args):
+    global _hash_executor, _hash_semaphore
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(max_workers=AUTH_HASH_WORKERS, thread_name_prefix="bcrypt")
+        _hash_semaphore = asyncio.Semaphore(AUTH_HASH_CONCURRENCY)
+    async with _hash_semaphore:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, func, *args)
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password() off the event loop."""
+    return await _run_bcrypt(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password() off the event loop."""
+    return await _run_bcrypt(verify_password, plain_password, hashed_password)
+
+
+def shutdown_hash_executor():
+    global _hash_executor, _hash_semaphore
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False)
+        _hash_executor = None
+        _hash_semaphore = None
+
+
+class TokenCache:
+    """LRU of token hash -> (user ID, expiry) for already-verified JWTs."""
+
+    def __init__(self, max_size: int = AUTH_TOKEN_CACHE_SIZE, ttl: float = AUTH_TOKEN_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[str]:
+        key = self.key(token)
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.time():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, token: str, user_id: str, token_exp: Optional[float] = None):
+        # Never cache past the token's own expiry
+        expires = time.time() + self.ttl
+        if token_exp is not None:
+            expires = min(expires, token_exp)
+        key = self.key(token)
+        self._entries[key] = (user_id, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+token_cache = TokenCache()
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -41,25 +129,40 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-async def verify_token(credentials: HTTPAuthCredentials = Depends(security)) -> str:
+def _decode(token: str) -> str:
+    """Verify a token (cached) and return its user ID; raises jwt errors."""
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    user_id = payload.get("sub")
+    if user_id is None:
+        raise jwt.InvalidTokenError("Token has no subject")
+    token_cache.put(token, user_id, payload.get("exp"))
+    return user_id
+
+
+async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
     """Verify JWT token and return user ID."""
     token = credentials.credentials
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials"
-            )
+        user_id = _decode(token)
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has expired"
         )
-    except jwt.JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials"
         )
     return user_id
+
+
+def decode_token(token: str) -> Optional[str]:
+    """Return the user ID of a valid, unexpired token, else None."""
+    try:
+        return _decode(token)
+    except jwt.InvalidTokenError:
+        return None
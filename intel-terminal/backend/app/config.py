@@ -4,10 +4,74 @@ from dotenv import load_dotenv
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./intel.db")
+
+# SQLite file databases: WAL mode with a reader pool and a single writer connection
+SQLITE_WAL = os.getenv("SQLITE_WAL", "true").lower() in ("1", "true", "yes")
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", 8))
+SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000))  # ms
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", -65536))  # negative = KiB (64 MB)
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 268435456))  # 256 MB
 DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL", "")
+# Discord alerts: minimum article severity, in-memory queue length, and the spool
+# file for alerts that could not be delivered (replayed on the next start)
+DISCORD_MIN_SEVERITY = int(os.getenv("DISCORD_MIN_SEVERITY", 7))
+DISCORD_QUEUE_SIZE = int(os.getenv("DISCORD_QUEUE_SIZE", 1000))
+DISCORD_SPOOL_PATH = os.getenv("DISCORD_SPOOL_PATH", "./discord_spool.jsonl")
 RSS_CHECK_INTERVAL = int(os.getenv("RSS_CHECK_INTERVAL", 5))
 MAX_ARTICLES_PER_FEED = int(os.getenv("MAX_ARTICLES_PER_FEED", 10))
 
+# Sanitized entry text is truncated to these lengths (Article.title is VARCHAR(500))
+MAX_TITLE_LENGTH = int(os.getenv("MAX_TITLE_LENGTH", 500))
+MAX_DESCRIPTION_LENGTH = int(os.getenv("MAX_DESCRIPTION_LENGTH", 4000))
+# HTML -> text: "regex" (fastest on typical summaries), or "selectolax" / "lxml" /
+# "auto" for a real HTML parser when installed (more robust on malformed markup)
+SANITIZE_HTML_PARSER = os.getenv("SANITIZE_HTML_PARSER", "regex").lower()
+
+# Feed fetch concurrency (global / per host) and per-feed timeout in seconds
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", 20))
+FETCH_PER_HOST_CONCURRENCY = int(os.getenv("FETCH_PER_HOST_CONCURRENCY", 2))
+FETCH_TIMEOUT = float(os.getenv("FETCH_TIMEOUT", 20))
+
+# Adaptive per-source polling: interval bounds (minutes), jitter fraction, and
+# how many recent articles are used to learn a feed's publish cadence.
+# RSS_CHECK_INTERVAL is the interval for sources without enough history.
+POLL_MIN_INTERVAL = float(os.getenv("POLL_MIN_INTERVAL", 1))
+POLL_MAX_INTERVAL = float(os.getenv("POLL_MAX_INTERVAL", 60))
+POLL_JITTER = float(os.getenv("POLL_JITTER", 0.1))
+POLL_HISTORY_SIZE = int(os.getenv("POLL_HISTORY_SIZE", 20))
+
+# Feed parsing worker processes (0 = parse in a thread inside the API process)
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", 0))
+
+# WebSocket fan-out: per-client outbound queue length and send timeout (seconds)
+WS_QUEUE_SIZE = int(os.getenv("WS_QUEUE_SIZE", 100))
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", 10))
+# New-article frames are coalesced for up to WS_BATCH_WINDOW seconds / WS_BATCH_SIZE articles
+WS_BATCH_WINDOW = float(os.getenv("WS_BATCH_WINDOW", 0.5))
+WS_BATCH_SIZE = int(os.getenv("WS_BATCH_SIZE", 50))
+
+# Article listing API: max page size and category/source lookup cache TTL (seconds)
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 500))
+LOOKUP_CACHE_TTL = float(os.getenv("LOOKUP_CACHE_TTL", 60))
+
+# In-memory article hash dedup cache (set DEDUP_BLOOM_CAPACITY=0 to disable the Bloom filter)
+DEDUP_LRU_SIZE = int(os.getenv("DEDUP_LRU_SIZE", 10000))
+DEDUP_BLOOM_CAPACITY = int(os.getenv("DEDUP_BLOOM_CAPACITY", 1000000))
+DEDUP_BLOOM_ERROR_RATE = float(os.getenv("DEDUP_BLOOM_ERROR_RATE", 0.01))
+
+# Severity keywords as JSON {"keyword": score} (empty = built-in list); the file and
+# users' watchlist keywords are re-checked every KEYWORDS_RELOAD_INTERVAL seconds
+KEYWORDS_FILE = os.getenv("KEYWORDS_FILE", "")
+KEYWORDS_RELOAD_INTERVAL = int(os.getenv("KEYWORDS_RELOAD_INTERVAL", 60))
+
+# Retention: articles older than RETENTION_DAYS (0 = keep forever) are moved to
+# gzipped JSONL segments in ARCHIVE_DIR, RETENTION_BATCH_SIZE rows per transaction,
+# every RETENTION_INTERVAL minutes
+RETENTION_DAYS = int(os.getenv("RETENTION_DAYS", 30))
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", 500))
+RETENTION_INTERVAL = int(os.getenv("RETENTION_INTERVAL", 60))
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "./archive")
+
 # Comprehensive RSS sources organized by category
 DEFAULT_SOURCES = [
     # ===== CYBERSECURITY (Red) =====
@@ -0,0 +1,140 @@
+"""Materialized dashboard counters.
+
+Article totals (overall, per category, per source) live in
+``stat_counters`` and per-minute arrivals in ``article_buckets``. Both are
+updated in the same transaction as the article inserts, so the stats
+endpoints read a handful of rows instead of running COUNT(*) over
+``articles``.
+"""
+
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import dialect_insert
+from app.models import Article, ArticleBucket, Category, Source, StatCounter
+
+logger = logging.getLogger(__name__)
+
+BUCKET_RETENTION = timedelta(hours=24)
+
+
+def category_key(category_id) -> str:
+    return f"articles:category:{category_id or 0}"
+
+
+def source_key(source_id) -> str:
+    return f"articles:source:{source_id or 0}"
+
+
+async def increment(db: AsyncSession, deltas: Dict[str, int]):
+    """Add deltas to counters with a single upsert (no commit)"""
+    deltas = {key: value for key, value in deltas.items() if value}
+    if not deltas:
+        return
+    stmt = dialect_insert(db, StatCounter.__table__).values(
+        [{"key": key, "value": value} for key, value in deltas.items()]
+    )
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=["key"],
+        set_={"value": StatCounter.__table__.c.value + stmt.excluded.value},
+    ))
+
+
+async def set_value(db: AsyncSession, key: str, value: int):
+    stmt = dialect_insert(db, StatCounter.__table__).values(key=key, value=value)
+    await db.execute(stmt.on_conflict_do_update(index_elements=["key"], set_={"value": value}))
+
+
+async def record_ingest(db: AsyncSession, rows: List[Dict], now: datetime = None):
+    """Count newly inserted article rows; runs inside the ingest transaction"""
+    if not rows:
+        return
+    now = now or datetime.utcnow()
+    deltas = Counter({"articles": len(rows)})
+    per_category = Counter(row["category_id"] or 0 for row in rows)
+    for row in rows:
+        deltas[source_key(row["source_id"])] += 1
+    for category_id, count in per_category.items():
+        deltas[category_key(category_id)] += count
+    await increment(db, deltas)
+
+    minute = now.replace(second=0, microsecond=0)
+    stmt = dialect_insert(db, ArticleBucket.__table__).values([
+        {"minute": minute, "category_id": category_id, "count": count}
+        for category_id, count in per_category.items()
+    ])
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=["minute", "category_id"],
+        set_={"count": ArticleBucket.__table__.c.count + stmt.excluded.count},
+    ))
+    await db.execute(delete(ArticleBucket).where(ArticleBucket.minute < now - BUCKET_RETENTION))
+
+
+async def record_removal(db: AsyncSession, rows: Iterable[Article]):
+    """Take deleted (archived) articles out of the counters (no commit)"""
+    deltas = Counter()
+    for article in rows:
+        deltas["articles"] -= 1
+        deltas[category_key(article.category_id)] -= 1
+        deltas[source_key(article.source_id)] -= 1
+    await increment(db, deltas)
+
+
+async def refresh_table_counts(db: AsyncSession):
+    """Recount the (small) sources and categories tables after a write"""
+    await set_value(db, "sources", await db.scalar(select(func.count(Source.id))) or 0)
+    await set_value(db, "categories", await db.scalar(select(func.count(Category.id))) or 0)
+    await db.commit()
+
+
+async def rebuild(db: AsyncSession):
+    """Recompute every article counter from the articles table"""
+    await db.execute(delete(StatCounter))
+    await increment(db, {"articles": await db.scalar(select(func.count(Article.id))) or 0})
+    await increment(db, {
+        category_key(category_id): count for category_id, count in
+        await db.execute(select(Article.category_id, func.count(Article.id)).group_by(Article.category_id))
+    })
+    await increment(db, {
+        source_key(source_id): count for source_id, count in
+        await db.execute(select(Article.source_id, func.count(Article.id)).group_by(Article.source_id))
+    })
+    await refresh_table_counts(db)
+    logger.info("Rebuilt dashboard counters")
+
+
+async def ensure_counters(db: AsyncSession):
+    """Build the counters on first start (or after they were cleared)"""
+    if await db.get(StatCounter, "articles") is None:
+        await rebuild(db)
+    else:
+        await refresh_table_counts(db)
+
+
+async def get_counters(db: AsyncSession) -> Dict[str, int]:
+    return {key: value for key, value in await db.execute(select(StatCounter.key, StatCounter.value))}
+
+
+async def recent_by_category(db: AsyncSession, window: timedelta = timedelta(hours=1)) -> Dict[int, int]:
+    """Articles ingested within ``window``, per category id"""
+    since = datetime.utcnow() - window
+    return {
+        category_id: count for category_id, count in
+        await db.execute(
+            select(ArticleBucket.category_id, func.sum(ArticleBucket.count))
+            .where(ArticleBucket.minute >= since)
+            .group_by(ArticleBucket.category_id)
+        )
+    }
+
+
+def prefixed(counters: Dict[str, int], prefix: str) -> Iterable:
+    """(id, value) pairs for counters named ``<prefix><id>``"""
+    for key, value in counters.items():
+        if key.startswith(prefix):
+            yield int(key[len(prefix):]), value
@@ -1,26 +1,129 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
-from app.config import DATABASE_URL
+from sqlalchemy import event, inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+from sqlalchemy.sql.dml import UpdateBase
+from app.config import (
+    DATABASE_URL,
+    SQLITE_BUSY_TIMEOUT,
+    SQLITE_CACHE_SIZE,
+    SQLITE_MMAP_SIZE,
+    SQLITE_READ_POOL_SIZE,
+    SQLITE_WAL,
+)
 from app.models import Base
+from app.search import ensure_search_index
 
-# For SQLite, use StaticPool for in-memory or file-based
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool if "sqlite" in DATABASE_URL else None
+url = make_url(DATABASE_URL)
+is_sqlite = url.get_backend_name() == "sqlite"
+is_sqlite_file = is_sqlite and url.database not in (None, "", ":memory:")
+
+# The whole backend runs on asyncio: swap in the async driver
+# (aiosqlite for SQLite, asyncpg for PostgreSQL)
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+async_url = url.set(drivername="+".join((
+    url.get_backend_name(),
+    ASYNC_DRIVERS.get(url.get_backend_name(), url.get_driver_name()),
+)))
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}")
+    cursor.execute(f"PRAGMA cache_size={SQLITE_CACHE_SIZE}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+if is_sqlite_file and SQLITE_WAL:
+    # WAL lets readers run alongside a writer. All writes go through one
+    # dedicated connection (so they queue in the pool instead of failing
+    # with SQLITE_BUSY); reads use a separate pool.
+    engine = create_async_engine(
+        async_url,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=SQLITE_BUSY_TIMEOUT / 1000,
+    )
+    read_engine = create_async_engine(
+        async_url,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=SQLITE_READ_POOL_SIZE,
+        max_overflow=SQLITE_READ_POOL_SIZE,
+    )
+    event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+    event.listen(read_engine.sync_engine, "connect", _set_sqlite_pragmas)
+elif is_sqlite_file:
+    engine = create_async_engine(async_url, poolclass=AsyncAdaptedQueuePool)
+    read_engine = engine
+elif is_sqlite:
+    # In-memory SQLite only exists within one connection: share it
+    engine = create_async_engine(async_url, poolclass=StaticPool)
+    read_engine = engine
+else:
+    engine = create_async_engine(async_url, pool_pre_ping=True)
+    read_engine = engine
+
+class RoutingSession(Session):
+    """Sends flushes and INSERT/UPDATE/DELETE to the writer, everything else to the readers"""
+
+    # Reads never see this session's uncommitted writes: commit before
+    # reading back anything written in the same session.
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or isinstance(clause, UpdateBase):
+            return engine.sync_engine
+        return read_engine.sync_engine
+
+SessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession if read_engine is not engine else Session,
+    expire_on_commit=False
 )
 
-SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+def dialect_insert(db: AsyncSession, table):
+    """INSERT construct supporting ON CONFLICT for the session's backend"""
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(table)
+
+def add_missing_columns(conn: Connection):
+    """Add nullable columns introduced after a table was first created.
+
+    create_all() never alters existing tables, so databases created by an
+    older version would otherwise fail on the new columns.
+    """
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            col_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(text(
+                f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {col_type}'
+            ))
+
+def add_missing_indexes(conn: Connection):
+    """Create indexes added to models after their table already existed"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=conn, checkfirst=True)
 
-def init_db():
+async def init_db():
     """Initialize database tables"""
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(add_missing_columns)
+        await conn.run_sync(add_missing_indexes)
+        await conn.run_sync(ensure_search_index)
 
-def get_db():
+async def get_db():
     """Dependency for getting DB session"""
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -0,0 +1,142 @@
+"""Process-local dedup front for article hashes.
+
+A bounded LRU answers "already seen" for recently polled entries, and an
+optional Bloom filter over every stored hash answers "definitely new"
+without a database round-trip. Only hashes that are in neither (a Bloom
+positive that fell out of the LRU) still need a lookup in ``articles``
+(and ``archived_hashes``).
+"""
+
+import logging
+import math
+from collections import OrderedDict
+from typing import Iterable, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import DEDUP_BLOOM_CAPACITY, DEDUP_BLOOM_ERROR_RATE, DEDUP_LRU_SIZE
+from app.models import ArchivedHash, Article
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter keyed by hex SHA256 digests."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest: str):
+        # The key is already a uniform hash: derive k indices by double hashing.
+        # Only the first 64 bits are used, so archived keys map to the same bits.
+        h1 = int(digest[:8], 16)
+        h2 = int(digest[8:16], 16) | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, digest: str):
+        for pos in self._positions(digest):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, digest: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(digest))
+
+
+def archive_key(article_hash: str) -> int:
+    """First 64 bits of a hex SHA256 digest as a signed BIGINT"""
+    key = int(article_hash[:16], 16)
+    return key - (1 << 64) if key >= 1 << 63 else key
+
+
+def key_digest(key: int) -> str:
+    """Inverse of archive_key(): the digest prefix the Bloom filter hashes"""
+    return format(key & ((1 << 64) - 1), "016x")
+
+
+class DedupCache:
+    """LRU of recent hashes plus an optional Bloom filter of all stored hashes."""
+
+    def __init__(self, lru_size: int = DEDUP_LRU_SIZE,
+                 bloom_capacity: int = DEDUP_BLOOM_CAPACITY,
+                 bloom_error_rate: float = DEDUP_BLOOM_ERROR_RATE):
+        self.lru_size = lru_size
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+        self.bloom = BloomFilter(bloom_capacity, bloom_error_rate) if bloom_capacity > 0 else None
+        self.warmed = False
+        self.hits = 0            # answered "seen" by the LRU
+        self.bloom_negatives = 0  # answered "new" by the Bloom filter
+        self.misses = 0          # had to be checked against the database
+
+    def add(self, article_hash: str):
+        """Record a hash that is known to be stored"""
+        self._recent[article_hash] = None
+        self._recent.move_to_end(article_hash)
+        while len(self._recent) > self.lru_size:
+            self._recent.popitem(last=False)
+        if self.bloom is not None:
+            self.bloom.add(article_hash)
+
+    def add_many(self, hashes: Iterable[str]):
+        for article_hash in hashes:
+            self.add(article_hash)
+
+    def partition(self, hashes: Iterable[str]) -> Tuple[List[str], List[str], List[str]]:
+        """Split hashes into (seen, new, unknown); only ``unknown`` needs the DB"""
+        seen, new, unknown = [], [], []
+        for article_hash in hashes:
+            if article_hash in self._recent:
+                self._recent.move_to_end(article_hash)
+                self.hits += 1
+                seen.append(article_hash)
+            elif self.warmed and self.bloom is not None and article_hash not in self.bloom:
+                self.bloom_negatives += 1
+                new.append(article_hash)
+            else:
+                self.misses += 1
+                unknown.append(article_hash)
+        return seen, new, unknown
+
+    async def warm(self, db: AsyncSession, batch_size: int = 10000):
+        """Load stored hashes: all into the Bloom filter, the newest into the LRU"""
+        if self.bloom is not None:
+            count = 0
+            result = await db.stream_scalars(
+                select(Article.article_hash).execution_options(yield_per=batch_size)
+            )
+            async for article_hash in result:
+                self.bloom.add(article_hash)
+                count += 1
+            # Archived articles keep only a 64-bit key, which is all the filter needs
+            result = await db.stream_scalars(
+                select(ArchivedHash.key).execution_options(yield_per=batch_size)
+            )
+            async for key in result:
+                self.bloom.add(key_digest(key))
+                count += 1
+            logger.info(f"Dedup Bloom filter warmed with {count} hashes")
+        recent = (await db.scalars(
+            select(Article.article_hash)
+            .order_by(Article.id.desc())
+            .limit(self.lru_size)
+        )).all()
+        for article_hash in reversed(recent):
+            self._recent[article_hash] = None
+        self.warmed = True
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.bloom_negatives + self.misses
+        return {
+            "lru_size": len(self._recent),
+            "lru_capacity": self.lru_size,
+            "bloom_enabled": self.bloom is not None,
+            "hits": self.hits,
+            "bloom_negatives": self.bloom_negatives,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.bloom_negatives) / lookups, 4) if lookups else 0.0,
+        }
+
+
+dedup_cache = DedupCache()
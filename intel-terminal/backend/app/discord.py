@@ -1,16 +1,33 @@
-import requests
+"""Discord webhook alerts.
+
+``send_discord_alert`` only queues an embed; a background dispatcher
+posts them with a shared async HTTP client, up to 10 embeds per webhook
+call (Discord's limit). It honours Discord's rate-limit headers: it waits
+out ``X-RateLimit-Reset-After`` when a bucket is exhausted and
+``Retry-After`` on 429. Batches that still fail, and anything queued at
+shutdown, go to a JSONL spool file that is replayed on the next start.
+"""
+
+import asyncio
+import json
 import logging
-from app.config import DISCORD_WEBHOOK_URL
+import os
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.config import DISCORD_QUEUE_SIZE, DISCORD_SPOOL_PATH, DISCORD_WEBHOOK_URL
 
 logger = logging.getLogger(__name__)
 
-async def send_discord_alert(title: str, link: str, source: str, severity: int = 0):
-    """Send alert to Discord webhook"""
-    
-    if not DISCORD_WEBHOOK_URL:
-        logger.debug("Discord webhook not configured")
-        return
-    
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_ATTEMPTS = 5
+BATCH_WINDOW = 1.0  # seconds to wait for more embeds before posting a partial batch
+SPOOL_RETRY_INTERVAL = 60.0  # seconds between replays of the spool while running
+
+
+def build_embed(title: str, link: str, source: str, severity: int = 0) -> Dict:
     # Color based on severity
     color_map = {
         9: 16711680,  # Red for critical
@@ -18,9 +35,9 @@ async def send_discord_alert(title: str, link: str, source: str, severity: int =
         7: 16776960,  # Yellow for medium
         5: 65535,     # Cyan for low
     }
-    
+
     color = color_map.get(severity, 9999999)
-    
+
     # Severity label
     severity_label = {
         10: "🔴 CRITICAL",
@@ -29,21 +46,230 @@ async def send_discord_alert(title: str, link: str, source: str, severity: int =
         7: "🟡 MEDIUM",
         5: "🔵 LOW",
     }.get(severity, "ℹ️ INFO")
-    
-    embed = {
-        "title": title,
+
+    return {
+        "title": title[:256],  # Discord embed title limit
         "url": link,
         "description": f"**Source:** {source}\n**Severity:** {severity_label}",
         "color": color
     }
-    
-    payload = {
-        "embeds": [embed]
-    }
-    
-    try:
-        response = requests.post(DISCORD_WEBHOOK_URL, json=payload, timeout=5)
-        response.raise_for_status()
-        logger.info(f"Discord alert sent: {title[:50]}")
-    except Exception as e:
-        logger.error(f"Failed to send Discord alert: {e}")
+
+
+class RetryableError(Exception):
+    """Network error or 5xx: the batch should be retried later"""
+
+
+class RateLimited(RetryableError):
+    """429: retry once the rate-limit window has passed"""
+
+
+class AlertRejected(Exception):
+    """Other 4xx (bad payload, deleted webhook): retrying can't succeed"""
+
+
+class AlertDispatcher:
+    """Queues embeds and posts them in batches, respecting rate limits."""
+
+    def __init__(self, webhook_url: str = DISCORD_WEBHOOK_URL,
+                 spool_path: str = DISCORD_SPOOL_PATH,
+                 queue_size: int = DISCORD_QUEUE_SIZE):
+        self.webhook_url = webhook_url
+        self.spool_path = spool_path
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._blocked_until = 0.0  # monotonic time the webhook's bucket resets
+        self._last_replay = 0.0
+        self.sent = 0
+        self.spooled = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.webhook_url)
+
+    async def start(self):
+        if not self.enabled or self._worker is not None:
+            return
+        self._client = httpx.AsyncClient(timeout=httpx.Timeout(10.0))
+        for embed in self._read_spool():
+            self.enqueue(embed)
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the worker; whatever is still queued is spooled to disk"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        pending = []
+        while not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        self._spool(pending)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def enqueue(self, embed: Dict):
+        """Queue an embed without blocking; spills to the spool when full"""
+        try:
+            self.queue.put_nowait(embed)
+        except asyncio.QueueFull:
+            self._spool([embed])
+
+    async def _next_batch(self) -> List[Dict]:
+        """Up to 10 queued embeds; empty after SPOOL_RETRY_INTERVAL idle"""
+        try:
+            batch = [await asyncio.wait_for(self.queue.get(), SPOOL_RETRY_INTERVAL)]
+        except asyncio.TimeoutError:
+            return []
+        deadline = time.monotonic() + BATCH_WINDOW
+        while len(batch) < MAX_EMBEDS_PER_MESSAGE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+            except asyncio.CancelledError:
+                # Already off the queue, so stop() would not spool them
+                self._spool(batch)
+                raise
+        return batch
+
+    async def _run(self):
+        while True:
+            if self.queue.empty() and time.monotonic() - self._last_replay > SPOOL_RETRY_INTERVAL:
+                # Idle: retry whatever earlier failures left in the spool
+                self._last_replay = time.monotonic()
+                for embed in self._read_spool():
+                    self.enqueue(embed)
+            batch = await self._next_batch()
+            if not batch:
+                continue
+            try:
+                await self._deliver(batch)
+            except asyncio.CancelledError:
+                self._spool(batch)
+                raise
+            except AlertRejected as e:
+                logger.error(f"Discord rejected alert batch, dropped: {e}")
+            except Exception as e:
+                logger.error(f"Discord alert batch failed, spooled: {e}")
+                self._spool(batch)
+
+    async def _deliver(self, batch: List[Dict]):
+        """Post one batch, retrying rate limits and transient errors"""
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            delay = self._blocked_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                await self._post(batch)
+                self.sent += len(batch)
+                logger.info(f"Discord alerts sent: {len(batch)}")
+                return
+            except RateLimited as e:
+                if attempt == MAX_ATTEMPTS:
+                    raise
+                logger.warning(f"Discord webhook {e}")
+            except RetryableError as e:
+                if attempt == MAX_ATTEMPTS:
+                    raise
+                backoff = min(2 ** attempt, 60)
+                logger.warning(f"Discord webhook error ({e}), retrying in {backoff}s")
+                await asyncio.sleep(backoff)
+
+    async def _post(self, batch: List[Dict]):
+        try:
+            response = await self._client.post(self.webhook_url, json={"embeds": batch})
+        except httpx.HTTPError as e:
+            raise RetryableError(repr(e))
+
+        self._update_bucket(response)
+        if response.status_code == 429:
+            retry_after = self._retry_after(response)
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+            raise RateLimited(f"rate limited for {retry_after:.1f}s")
+        if response.status_code >= 500:
+            raise RetryableError(f"HTTP {response.status_code}")
+        if response.status_code >= 400:
+            raise AlertRejected(f"HTTP {response.status_code} {response.text[:200]}")
+
+    def _update_bucket(self, response: httpx.Response):
+        """Pause before the next call when the webhook's bucket is used up.
+
+        A webhook URL maps to a single Discord bucket, so one reset time
+        is enough; a global 429 is handled the same way via Retry-After.
+        """
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            try:
+                reset_after = float(response.headers.get("X-RateLimit-Reset-After", 1))
+            except ValueError:
+                reset_after = 1.0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + reset_after)
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> float:
+        try:
+            return float(response.json().get("retry_after"))
+        except (ValueError, TypeError, AttributeError):
+            pass
+        try:
+            return float(response.headers.get("Retry-After", 1))
+        except ValueError:
+            return 1.0
+
+    def _spool(self, embeds: List[Dict]):
+        if not embeds:
+            return
+        try:
+            with open(self.spool_path, "a", encoding="utf-8") as f:
+                for embed in embeds:
+                    f.write(json.dumps(embed, ensure_ascii=False) + "\n")
+            self.spooled += len(embeds)
+        except OSError as e:
+            logger.error(f"Could not spool {len(embeds)} Discord alerts: {e}")
+
+    def _read_spool(self) -> List[Dict]:
+        """Load and clear the spool left by a previous run"""
+        if not os.path.exists(self.spool_path):
+            return []
+        embeds = []
+        try:
+            with open(self.spool_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        embeds.append(json.loads(line))
+                    except ValueError:
+                        continue
+            os.remove(self.spool_path)
+        except OSError as e:
+            logger.error(f"Could not read Discord spool: {e}")
+        if embeds:
+            logger.info(f"Replaying {len(embeds)} spooled Discord alerts")
+        return embeds
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "queued": self.queue.qsize(),
+            "sent": self.sent,
+            "spooled": self.spooled,
+        }
+
+
+dispatcher = AlertDispatcher()
+
+
+async def send_discord_alert(title: str, link: str, source: str, severity: int = 0):
+    """Queue an alert for the Discord webhook (never blocks on the network)"""
+
+    if not DISCORD_WEBHOOK_URL:
+        logger.debug("Discord webhook not configured")
+        return
+
+    dispatcher.enqueue(build_embed(title, link, source, severity))
@@ -0,0 +1,120 @@
+"""Concurrent HTTP fetch stage for RSS sources."""
+
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import FETCH_CONCURRENCY, FETCH_PER_HOST_CONCURRENCY, FETCH_TIMEOUT
+from app.parsing import ParsedFeed, parse_feed_async
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "IntelTerminal/1.0 (+https://github.com/g1ftb4sk3t4u/AI-tools-)"
+
+
+@dataclass
+class FetchResult:
+    """Outcome of a conditional feed fetch; ``feed`` is None when unchanged"""
+    feed: Optional[ParsedFeed]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+
+    @property
+    def unchanged(self) -> bool:
+        return self.feed is None
+
+
+class FeedFetcher:
+    """Shared async HTTP client with global and per-host concurrency limits."""
+
+    def __init__(self, concurrency: int = FETCH_CONCURRENCY,
+                 per_host: int = FETCH_PER_HOST_CONCURRENCY,
+                 timeout: float = FETCH_TIMEOUT):
+        self.timeout = timeout
+        self.per_host = per_host
+        self._global = asyncio.Semaphore(concurrency)
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(max_connections=concurrency),
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+        )
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).hostname or ""
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.per_host)
+        return self._hosts[host]
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """GET a feed URL, bounded by both semaphores and the per-feed timeout"""
+        async with self._global, self._host_semaphore(url):
+            return await asyncio.wait_for(
+                self._client.get(url, headers=headers), self.timeout
+            )
+
+    async def fetch_feed(self, url: str, etag: Optional[str] = None,
+                         last_modified: Optional[str] = None,
+                         content_hash: Optional[str] = None) -> FetchResult:
+        """Conditionally download a feed and parse it off the event loop.
+
+        Sends If-None-Match / If-Modified-Since from the previous fetch and
+        skips parsing on a 304 or when the body hash is unchanged.
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        response = await self.get(url, headers=headers)
+        if response.status_code == 304:
+            return FetchResult(
+                None,
+                etag=response.headers.get("etag", etag),
+                last_modified=response.headers.get("last-modified", last_modified),
+                content_hash=content_hash,
+            )
+        response.raise_for_status()
+
+        body = response.content
+        result = FetchResult(
+            None,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            content_hash=hashlib.sha256(body).hexdigest(),
+        )
+        if result.content_hash == content_hash:
+            return result
+
+        result.feed = await parse_feed_async(body, dict(response.headers))
+        return result
+
+    async def close(self):
+        await self._client.aclose()
+
+
+_fetcher: Optional[FeedFetcher] = None
+
+
+def get_fetcher() -> FeedFetcher:
+    """Return the process-wide fetcher, creating it on first use"""
+    global _fetcher
+    if _fetcher is None:
+        _fetcher = FeedFetcher()
+    return _fetcher
+
+
+async def close_fetcher():
+    """Close the shared HTTP client (called on shutdown)"""
+    global _fetcher
+    if _fetcher is not None:
+        await _fetcher.close()
+        _fetcher = None
@@ -0,0 +1,45 @@
+"""In-memory category / source lookups used to decorate article rows.
+
+Invalidated explicitly by the write endpoints; the TTL bounds staleness
+when several worker processes share one database.
+"""
+
+import hashlib
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import LOOKUP_CACHE_TTL
+from app.models import Category, Source
+
+
+class LookupCache:
+    def __init__(self, ttl: float = LOOKUP_CACHE_TTL):
+        self.ttl = ttl
+        self.fingerprint = ""  # changes whenever the lookup contents change
+        self.category_names: Dict[int, str] = {}
+        self.category_ids: Dict[str, int] = {}
+        self.source_colors: Dict[int, str] = {}
+        self._loaded_at: Optional[float] = None
+
+    def invalidate(self):
+        self._loaded_at = None
+
+    async def get(self, db: AsyncSession) -> "LookupCache":
+        """Return self, reloading from the DB when invalidated or expired"""
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl:
+            categories = (await db.execute(select(Category.id, Category.name))).all()
+            self.category_names = {cid: name for cid, name in categories}
+            self.category_ids = {name: cid for cid, name in categories}
+            self.source_colors = dict((await db.execute(select(Source.id, Source.color))).all())
+            self._loaded_at = time.monotonic()
+            self.fingerprint = hashlib.sha1(repr((
+                sorted(self.category_names.items()),
+                sorted(self.source_colors.items()),
+            )).encode()).hexdigest()[:12]
+        return self
+
+
+lookup_cache = LookupCache()
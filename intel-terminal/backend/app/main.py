@@ -1,14 +1,33 @@
+import hashlib
 import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from datetime import datetime, timedelta
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlalchemy import func, select, tuple_
 from app.database import init_db, SessionLocal
-from app.models import Category, Source, Article
+from app.models import Category, Source, Article, ArticleRollup
 from app.websocket import router as websocket_router, broadcast_status
 from app.rss_engine import fetch_and_process_feeds
-from app.config import RSS_CHECK_INTERVAL, DEFAULT_SOURCES
+from app.fetcher import close_fetcher
+from app.auth import shutdown_hash_executor
+from app.discord import dispatcher as alert_dispatcher
+from app.parsing import shutdown_parse_executor
+from app.dedup import dedup_cache
+from app.poller import AdaptivePoller
+from app.lookups import lookup_cache
+from app.search import SEVERITY_RANGES, search_articles
+from app.schemas import ArticleSearchRequest
+from app.counters import ensure_counters, get_counters, prefixed, recent_by_category, refresh_table_counts
+from app.retention import run_retention
+from app.tagging import load_watchlists, reload_keywords
+from app.config import (
+    RSS_CHECK_INTERVAL, DEFAULT_SOURCES, MAX_PAGE_SIZE, RETENTION_DAYS, RETENTION_INTERVAL,
+    KEYWORDS_RELOAD_INTERVAL
+)
 import os
 
 # Logging
@@ -20,6 +39,7 @@ logger = logging.getLogger(__name__)
 
 # Scheduler
 scheduler = AsyncIOScheduler()
+poller = AdaptivePoller(scheduler)
 
 async def initialize_default_data():
     """Create default categories and sources if they don't exist"""
@@ -43,29 +63,29 @@ async def initialize_default_data():
             category_names.add(source["category"])
         
         for cat_name in category_names:
-            existing = db.query(Category).filter(Category.name == cat_name).first()
+            existing = await db.scalar(select(Category).where(Category.name == cat_name))
             if not existing:
                 category = Category(
                     name=cat_name, 
                     color=CATEGORY_COLORS.get(cat_name, "#ffffff")
                 )
                 db.add(category)
-                db.commit()
+                await db.commit()
                 logger.info(f"Created category: {cat_name}")
             else:
                 # Update color if it was #ffffff
                 if existing.color == "#ffffff":
                     existing.color = CATEGORY_COLORS.get(cat_name, "#ffffff")
-                    db.commit()
+                    await db.commit()
         
         # Create default sources
         for source_config in DEFAULT_SOURCES:
-            if not db.query(Source).filter(
+            if not await db.scalar(select(Source).where(
                 Source.rss_url == source_config["url"]
-            ).first():
-                category = db.query(Category).filter(
+            )):
+                category = await db.scalar(select(Category).where(
                     Category.name == source_config["category"]
-                ).first()
+                ))
                 
                 source = Source(
                     name=source_config["name"],
@@ -74,45 +94,59 @@ async def initialize_default_data():
                     category_id=category.id if category else None
                 )
                 db.add(source)
-                db.commit()
+                await db.commit()
                 logger.info(f"Created source: {source_config['name']}")
     finally:
-        db.close()
-
-async def scheduled_fetch():
-    """Scheduled task to fetch RSS feeds"""
-    db = SessionLocal()
-    try:
-        logger.info("Starting RSS fetch...")
-        await fetch_and_process_feeds(db)
-    except Exception as e:
-        logger.error(f"Scheduled fetch error: {e}")
-    finally:
-        db.close()
+        await db.close()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
     # Startup
     logger.info("Intel Terminal starting...")
-    init_db()
+    await init_db()
     await initialize_default_data()
     
+    db = SessionLocal()
+    try:
+        await ensure_counters(db)
+        await dedup_cache.warm(db)
+        await load_watchlists(db)
+        await poller.start(db)
+    finally:
+        await db.close()
+    
     scheduler.add_job(
-        scheduled_fetch,
+        reload_keywords,
         "interval",
-        minutes=RSS_CHECK_INTERVAL,
-        id="rss_fetch",
-        name="RSS Feed Fetch"
+        seconds=KEYWORDS_RELOAD_INTERVAL,
+        id="keyword_reload",
+        name="Keyword reload",
+        replace_existing=True
     )
+    if RETENTION_DAYS > 0:
+        scheduler.add_job(
+            run_retention,
+            "interval",
+            minutes=RETENTION_INTERVAL,
+            id="retention",
+            name="Article retention",
+            replace_existing=True,
+            next_run_time=datetime.now()
+        )
+    await alert_dispatcher.start()
     scheduler.start()
-    logger.info(f"Scheduler started (interval: {RSS_CHECK_INTERVAL} minutes)")
+    logger.info(f"Scheduler started (adaptive polling, default interval: {RSS_CHECK_INTERVAL} minutes)")
     
     yield
     
     # Shutdown
     logger.info("Intel Terminal shutting down...")
     scheduler.shutdown()
+    await close_fetcher()
+    await alert_dispatcher.stop()
+    shutdown_parse_executor()
+    shutdown_hash_executor()
 
 app = FastAPI(
     title="Intel Terminal",
@@ -155,11 +189,11 @@ if not frontend_path:
 
 
 @app.get("/api/sources")
-def get_sources():
+async def get_sources():
     """Get all RSS sources"""
     db = SessionLocal()
     try:
-        sources = db.query(Source).all()
+        sources = (await db.scalars(select(Source))).all()
         return [
             {
                 "id": s.id,
@@ -172,16 +206,16 @@ def get_sources():
             for s in sources
         ]
     finally:
-        db.close()
+        await db.close()
 
 @app.post("/api/sources")
-def add_source(data: dict):
+async def add_source(data: dict):
     """Add a new RSS source"""
     db = SessionLocal()
     try:
         # Look up category by name to get ID
         category_name = data.get("category", "Technology")
-        category = db.query(Category).filter(Category.name == category_name).first()
+        category = await db.scalar(select(Category).where(Category.name == category_name))
         category_id = category.id if category else None
         
         source = Source(
@@ -191,36 +225,42 @@ def add_source(data: dict):
             color=data.get("color", "#55ff55")
         )
         db.add(source)
-        db.commit()
+        await db.commit()
+        lookup_cache.invalidate()
+        await refresh_table_counts(db)
+        poller.schedule(source.id)
         return {"status": "created", "id": source.id}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         return {"status": "error", "detail": str(e)}
     finally:
-        db.close()
+        await db.close()
 
 @app.delete("/api/sources/{source_id}")
-def delete_source(source_id: int):
+async def delete_source(source_id: int):
     """Delete a source"""
     db = SessionLocal()
     try:
-        source = db.query(Source).filter(Source.id == source_id).first()
+        source = await db.get(Source, source_id)
         if source:
-            db.delete(source)
-            db.commit()
+            await db.delete(source)
+            await db.commit()
+            lookup_cache.invalidate()
+            await refresh_table_counts(db)
+            poller.unschedule(source_id)
         return {"status": "deleted"}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         return {"status": "error", "detail": str(e)}
     finally:
-        db.close()
+        await db.close()
 
 @app.get("/api/categories")
-def get_categories():
+async def get_categories():
     """Get all categories"""
     db = SessionLocal()
     try:
-        cats = db.query(Category).all()
+        cats = (await db.scalars(select(Category))).all()
         return [
             {
                 "id": c.id,
@@ -231,10 +271,10 @@ def get_categories():
             for c in cats
         ]
     finally:
-        db.close()
+        await db.close()
 
 @app.post("/api/categories")
-def add_category(data: dict):
+async def add_category(data: dict):
     """Add a new category"""
     db = SessionLocal()
     try:
@@ -243,29 +283,33 @@ def add_category(data: dict):
             color=data.get("color", "#00ffff")
         )
         db.add(category)
-        db.commit()
+        await db.commit()
+        lookup_cache.invalidate()
+        await refresh_table_counts(db)
         return {"status": "created", "id": category.id, "name": category.name}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         return {"status": "error", "detail": str(e)}
     finally:
-        db.close()
+        await db.close()
 
 @app.delete("/api/categories/{category_id}")
-def delete_category(category_id: int):
+async def delete_category(category_id: int):
     """Delete a category"""
     db = SessionLocal()
     try:
-        cat = db.query(Category).filter(Category.id == category_id).first()
+        cat = await db.get(Category, category_id)
         if cat:
-            db.delete(cat)
-            db.commit()
+            await db.delete(cat)
+            await db.commit()
+            lookup_cache.invalidate()
+            await refresh_table_counts(db)
         return {"status": "deleted"}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         return {"status": "error", "detail": str(e)}
     finally:
-        db.close()
+        await db.close()
 
 @app.post("/api/fetch")
 async def fetch_feeds():
@@ -277,53 +321,185 @@ async def fetch_feeds():
     except Exception as e:
         return {"status": "error", "detail": str(e)}
     finally:
-        db.close()
+        await db.close()
+
+def serialize_article(a: Article, lookups) -> dict:
+    """Article row -> API/frontend representation"""
+    return {
+        "id": a.id,
+        "title": a.title,
+        "url": a.link,
+        "summary": a.description or "No summary",
+        "source": a.source_name,
+        "source_color": lookups.source_colors.get(a.source_id, "#55ff55"),
+        "category": lookups.category_names.get(a.category_id, "Unknown"),
+        "category_id": a.category_id,
+        "published_at": a.timestamp.isoformat() + "Z" if a.timestamp else None,
+        "severity": "high" if a.severity >= 7 else "medium" if a.severity >= 4 else "low"
+    }
+
+def encode_cursor(article: Article) -> str:
+    return f"{article.timestamp.isoformat()}_{article.id}"
+
+def decode_cursor(cursor: str):
+    """Parse a "<timestamp>_<id>" keyset cursor"""
+    timestamp, _, article_id = cursor.rpartition("_")
+    return datetime.fromisoformat(timestamp), int(article_id)
 
 @app.get("/api/articles")
-def get_articles(category: str = None, limit: int = 50):
-    """Get articles with optional filtering"""
+async def get_articles(request: Request, category: str = None, limit: int = 50, cursor: str = None,
+                 since_id: int = None, since: str = None):
+    """Get articles, newest first, with optional category filter.
+
+    Keyset-paginated on (timestamp, id): pass the X-Next-Cursor header of
+    one page as ``cursor`` to get the next. ``since_id`` (rows stored after
+    that article) and ``since`` (published after an ISO timestamp) return
+    only the delta for incremental refreshes. Responses carry an ETag and
+    answer a matching If-None-Match with 304.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
     db = SessionLocal()
     try:
-        # Build category name lookup
-        cats = {c.id: c.name for c in db.query(Category).all()}
-        # Build source color lookup
-        source_colors = {s.id: s.color for s in db.query(Source).all()}
+        lookups = await lookup_cache.get(db)
         
-        query = db.query(Article).order_by(Article.timestamp.desc()).limit(limit)
+        query = select(Article)
         if category:
-            query = query.filter(Article.category_id == category)
-        articles = query.all()
-        return [
-            {
-                "id": a.id,
-                "title": a.title,
-                "url": a.link,
-                "summary": a.description or "No summary",
-                "source": a.source_name,
-                "source_color": source_colors.get(a.source_id, "#55ff55"),
-                "category": cats.get(a.category_id, "Unknown"),
-                "category_id": a.category_id,
-                "published_at": a.timestamp.isoformat() + "Z" if a.timestamp else None,
-                "severity": "high" if a.severity >= 7 else "medium" if a.severity >= 4 else "low"
-            }
-            for a in articles
-        ]
+            category_id = int(category) if category.isdigit() else lookups.category_ids.get(category)
+            if category_id is None:
+                return JSONResponse([])
+            query = query.where(Article.category_id == category_id)
+        if since_id is not None:
+            query = query.where(Article.id > since_id)
+        if since:
+            try:
+                query = query.where(Article.timestamp > datetime.fromisoformat(since.rstrip("Z")))
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid since timestamp")
+        if cursor:
+            try:
+                cursor_ts, cursor_id = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            query = query.where(tuple_(Article.timestamp, Article.id) < tuple_(cursor_ts, cursor_id))
+        articles = (await db.scalars(
+            query.order_by(Article.timestamp.desc(), Article.id.desc())
+            .limit(limit)
+        )).all()
+        
+        # Stored articles never change, so the page is identified by its ids
+        etag = '"%s"' % hashlib.sha1(
+            (lookups.fingerprint + ",".join(str(a.id) for a in articles)).encode()
+        ).hexdigest()
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if len(articles) == limit:
+            headers["X-Next-Cursor"] = encode_cursor(articles[-1])
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        
+        return JSONResponse(
+            [serialize_article(a, lookups) for a in articles],
+            headers=headers
+        )
     finally:
-        db.close()
+        await db.close()
+
+@app.post("/api/search")
+async def search(request: ArticleSearchRequest):
+    """Full-text search over title, description and tags, best match first.
+
+    Offset-paginated: a full page carries X-Next-Offset for the next one.
+    """
+    if request.severity and request.severity not in SEVERITY_RANGES:
+        raise HTTPException(status_code=400, detail="Invalid severity")
+    limit = max(1, min(request.limit, MAX_PAGE_SIZE))
+    offset = max(0, request.offset)
+    db = SessionLocal()
+    try:
+        lookups = await lookup_cache.get(db)
+        category_id = None
+        if request.category:
+            category = request.category
+            category_id = int(category) if category.isdigit() else lookups.category_ids.get(category)
+            if category_id is None:
+                return []
+        results = await search_articles(
+            db, request.query, category_id=category_id, severity=request.severity,
+            limit=limit, offset=offset
+        )
+        headers = {}
+        if len(results) == limit:
+            headers["X-Next-Offset"] = str(offset + limit)
+        return JSONResponse(
+            [dict(serialize_article(a, lookups), score=score) for a, score in results],
+            headers=headers
+        )
+    finally:
+        await db.close()
 
 @app.get("/api/dashboard-stats")
-def get_dashboard_stats():
-    """Get dashboard statistics"""
+async def get_dashboard_stats():
+    """Get dashboard statistics from the materialized counters"""
     db = SessionLocal()
     try:
-        total_articles = db.query(Article).count()
-        total_sources = db.query(Source).count()
+        counters = await get_counters(db)
+        recent = await recent_by_category(db)
+        lookups = await lookup_cache.get(db)
         return {
-            "total_articles": total_articles or 0,
-            "total_sources": total_sources or 0
+            "total_articles": counters.get("articles", 0),
+            "total_sources": counters.get("sources", 0),
+            "articles_last_hour": sum(recent.values()),
+            "categories": [
+                {
+                    "category": lookups.category_names.get(category_id, "Unknown"),
+                    "article_count": count,
+                    "recent_articles": recent.get(category_id, 0)
+                }
+                for category_id, count in prefixed(counters, "articles:category:")
+            ],
+            "last_update": datetime.utcnow().isoformat() + "Z"
         }
     finally:
-        db.close()
+        await db.close()
+
+@app.get("/api/daily-stats")
+async def get_daily_stats(days: int = 90):
+    """Per-day article counts of archived days (from the retention rollups)"""
+    db = SessionLocal()
+    try:
+        rows = await db.execute(
+            select(ArticleRollup.day, ArticleRollup.category_id,
+                   func.sum(ArticleRollup.count), func.sum(ArticleRollup.high_severity))
+            .where(ArticleRollup.day >= (datetime.utcnow() - timedelta(days=days)).date())
+            .group_by(ArticleRollup.day, ArticleRollup.category_id)
+            .order_by(ArticleRollup.day.desc())
+        )
+        lookups = await lookup_cache.get(db)
+        return [
+            {
+                "day": day.isoformat(),
+                "category": lookups.category_names.get(category_id, "Unknown"),
+                "articles": count,
+                "high_severity": high
+            }
+            for day, category_id, count, high in rows
+        ]
+    finally:
+        await db.close()
+
+@app.get("/api/dedup-stats")
+def get_dedup_stats():
+    """Get article dedup cache hit/miss counters"""
+    return dedup_cache.stats()
+
+@app.get("/api/alert-stats")
+def get_alert_stats():
+    """Get Discord alert dispatcher queue/sent/spooled counts"""
+    return alert_dispatcher.stats()
+
+@app.get("/api/poll-schedule")
+def get_poll_schedule():
+    """Get each source's next poll time, learned interval and error count"""
+    return poller.stats()
 
 @app.get("/api/health")
 async def health():
@@ -339,17 +515,16 @@ async def stats():
     """Get basic stats"""
     db = SessionLocal()
     try:
-        categories = db.query(Category).count()
-        sources = db.query(Source).count()
-        articles = db.query(Article).count()
-        
+        counters = await get_counters(db)
         return {
-            "categories": categories,
-            "sources": sources,
-            "articles": articles
+            "categories": counters.get("categories", 0),
+            "sources": counters.get("sources", 0),
+            "articles": counters.get("articles", 0),
+            "articles_last_hour": sum((await recent_by_category(db)).values()),
+            "articles_per_source": dict(prefixed(counters, "articles:source:"))
         }
     finally:
-        db.close()
+        await db.close()
 
 # Root endpoint fallback (only used if static files not found)
 @app.get("/")
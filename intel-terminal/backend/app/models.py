@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Index, JSON
+from sqlalchemy import BigInteger, Column, Date, Integer, String, Boolean, DateTime, Text, ForeignKey, Index, JSON
 from sqlalchemy.orm import declarative_base
 from datetime import datetime
 import hashlib
@@ -38,12 +38,18 @@ class Source(Base):
     category_id = Column(Integer, ForeignKey("categories.id"))
     enabled = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # HTTP cache validators from the last successful fetch (conditional GET)
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(64), nullable=True)
+    content_hash = Column(String(64), nullable=True)  # SHA256 of last feed body
 
 class Article(Base):
     __tablename__ = "articles"
     __table_args__ = (
         Index('idx_source_timestamp', 'source_id', 'timestamp'),
         Index('idx_article_hash', 'article_hash'),
+        Index('idx_timestamp_id', 'timestamp', 'id'),
+        Index('idx_category_timestamp', 'category_id', 'timestamp', 'id'),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -64,3 +70,34 @@ class Article(Base):
         """Generate unique hash for deduplication"""
         content = f"{title}{link}".encode()
         return hashlib.sha256(content).hexdigest()
+
+class StatCounter(Base):
+    """Materialized counters (total / per-category / per-source articles, etc.)"""
+    __tablename__ = "stat_counters"
+
+    key = Column(String(100), primary_key=True)
+    value = Column(Integer, default=0, nullable=False)
+
+class ArticleBucket(Base):
+    """Articles ingested per minute and category, for rolling recent counts"""
+    __tablename__ = "article_buckets"
+
+    minute = Column(DateTime, primary_key=True)
+    category_id = Column(Integer, primary_key=True, default=0)  # 0 = uncategorized
+    count = Column(Integer, default=0, nullable=False)
+
+class ArticleRollup(Base):
+    """Per-day article counts kept after the articles themselves are archived"""
+    __tablename__ = "article_rollups"
+
+    day = Column(Date, primary_key=True)
+    category_id = Column(Integer, primary_key=True, default=0)  # 0 = uncategorized
+    source_id = Column(Integer, primary_key=True, default=0)
+    count = Column(Integer, default=0, nullable=False)
+    high_severity = Column(Integer, default=0, nullable=False)  # severity >= 7
+
+class ArchivedHash(Base):
+    """Dedup keys of archived articles: the first 64 bits of article_hash"""
+    __tablename__ = "archived_hashes"
+
+    key = Column(BigInteger, primary_key=True, autoincrement=False)
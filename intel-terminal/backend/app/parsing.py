@@ -0,0 +1,112 @@
+"""Feed parsing stage: raw feed bytes -> compact normalized entries.
+
+``parse_feed`` is pure CPU work (feedparser, HTML sanitizing, hashing).
+It runs either in a worker thread or, when ``PARSE_WORKERS`` > 0, in a
+process pool so it stays off the API process's GIL. Keyword tagging
+happens later, at ingest, and only for entries that are actually new. Results are small picklable tuples.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from time import mktime
+from typing import Dict, List, NamedTuple, Optional
+
+import feedparser
+
+from app.config import MAX_ARTICLES_PER_FEED, MAX_DESCRIPTION_LENGTH, MAX_TITLE_LENGTH, PARSE_WORKERS
+from app.utils import generate_article_hash, sanitize_text
+
+logger = logging.getLogger(__name__)
+
+
+class ParsedEntry(NamedTuple):
+    title: str
+    link: str
+    description: str
+    article_hash: str
+    timestamp: datetime
+
+
+class ParsedFeed(NamedTuple):
+    entries: List[ParsedEntry]
+    error: Optional[str] = None  # feedparser bozo exception, if any
+
+
+def parse_feed_date(entry):
+    """Extract publication date from RSS entry"""
+    # Try various date fields RSS feeds use
+    for date_field in ['published_parsed', 'updated_parsed', 'created_parsed']:
+        time_struct = entry.get(date_field)
+        if time_struct:
+            try:
+                return datetime.fromtimestamp(mktime(time_struct))
+            except (ValueError, OverflowError):
+                continue
+    # Fallback to current time
+    return datetime.utcnow()
+
+
+def normalize_entry(entry) -> Optional[ParsedEntry]:
+    """Sanitize and hash one feedparser entry; None if unusable"""
+    title = sanitize_text(entry.get("title", "No title"), MAX_TITLE_LENGTH)
+    link = entry.get("link", "")
+    description = sanitize_text(entry.get("summary", ""), MAX_DESCRIPTION_LENGTH)
+
+    if not title or not link:
+        return None
+
+    return ParsedEntry(
+        title=title,
+        link=link,
+        description=description,
+        article_hash=generate_article_hash(title, link),
+        timestamp=parse_feed_date(entry),
+    )
+
+
+def parse_feed(body: bytes, response_headers: Optional[Dict[str, str]] = None,
+               limit: int = MAX_ARTICLES_PER_FEED) -> ParsedFeed:
+    """Parse raw feed bytes into at most ``limit`` normalized entries"""
+    feed = feedparser.parse(body, response_headers=response_headers or {})
+    entries = []
+    for entry in feed.entries[:limit]:
+        try:
+            parsed = normalize_entry(entry)
+        except Exception as e:
+            logger.error(f"Error normalizing entry: {e}")
+            continue
+        if parsed:
+            entries.append(parsed)
+    error = str(feed.bozo_exception) if feed.bozo else None
+    return ParsedFeed(entries, error)
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_parse_executor() -> Optional[ProcessPoolExecutor]:
+    """Return the parse process pool, or None to use a worker thread"""
+    global _executor
+    if _executor is None and PARSE_WORKERS > 0:
+        # spawn: never fork a process that has a running event loop and threads
+        _executor = ProcessPoolExecutor(
+            max_workers=PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+async def parse_feed_async(body: bytes, response_headers: Optional[Dict[str, str]] = None) -> ParsedFeed:
+    """Run ``parse_feed`` off the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_parse_executor(), parse_feed, body, response_headers)
+
+
+def shutdown_parse_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
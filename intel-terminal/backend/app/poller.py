@@ -0,0 +1,150 @@
+"""Adaptive per-source polling on top of APScheduler.
+
+Each enabled source gets its own one-shot job. After every poll the next
+delay is derived from the source's publish cadence (recent
+``Article.timestamp`` gaps), with jitter, and exponential backoff while
+the source keeps failing.
+"""
+
+import logging
+import random
+import statistics
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import (
+    POLL_HISTORY_SIZE,
+    POLL_JITTER,
+    POLL_MAX_INTERVAL,
+    POLL_MIN_INTERVAL,
+    RSS_CHECK_INTERVAL,
+)
+from app.database import SessionLocal
+from app.models import Article, Source
+from app.rss_engine import fetch_source
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptivePoller:
+    """Schedules one APScheduler job per source at a learned interval."""
+
+    def __init__(self, scheduler: AsyncIOScheduler):
+        self.scheduler = scheduler
+        self.failures: Dict[int, int] = {}
+        self.intervals: Dict[int, float] = {}  # seconds until the next poll
+
+    @staticmethod
+    def job_id(source_id: int) -> str:
+        return f"rss_source_{source_id}"
+
+    async def start(self, db: AsyncSession):
+        """Schedule every enabled source, staggering the first polls"""
+        sources = (await db.scalars(select(Source).where(Source.enabled == True))).all()
+        spread = min(60.0, POLL_MIN_INTERVAL * 60)
+        for source in sources:
+            self.schedule(source.id, random.uniform(0, spread))
+        logger.info(f"Adaptive poller scheduled {len(sources)} sources")
+
+    def schedule(self, source_id: int, delay: float = 0):
+        """(Re)schedule a source to be polled after ``delay`` seconds"""
+        self.scheduler.add_job(
+            self.poll,
+            "date",
+            run_date=datetime.now() + timedelta(seconds=delay),
+            args=[source_id],
+            id=self.job_id(source_id),
+            name=f"RSS poll {source_id}",
+            replace_existing=True,
+            misfire_grace_time=None,
+        )
+
+    def unschedule(self, source_id: int):
+        job = self.scheduler.get_job(self.job_id(source_id))
+        if job:
+            job.remove()
+        self.failures.pop(source_id, None)
+        self.intervals.pop(source_id, None)
+
+    async def poll(self, source_id: int):
+        """Poll one source and schedule its next run"""
+        try:
+            # Sessions are short-lived so none is held across the fetch
+            async with SessionLocal() as db:
+                source = await db.get(Source, source_id)
+            if source is None or not source.enabled:
+                self.unschedule(source_id)
+                return
+            try:
+                await fetch_source(source)
+                self.failures[source_id] = 0
+            except Exception as e:
+                self.failures[source_id] = self.failures.get(source_id, 0) + 1
+                logger.error(f"Error fetching {source.name} "
+                             f"(failure #{self.failures[source_id]}): {e!r}")
+            async with SessionLocal() as db:
+                interval = await self.next_interval(source_id, db)
+        except Exception as e:
+            logger.error(f"Poll error for source {source_id}: {e}")
+            interval = RSS_CHECK_INTERVAL * 60
+
+        self.intervals[source_id] = interval
+        self.schedule(source_id, interval)
+
+    async def next_interval(self, source_id: int, db: AsyncSession) -> float:
+        """Seconds until the next poll: cadence-based, jittered, backed off on errors"""
+        base = await self.cadence(source_id, db)
+        if base is None:
+            base = RSS_CHECK_INTERVAL * 60
+        base = min(max(base, POLL_MIN_INTERVAL * 60), POLL_MAX_INTERVAL * 60)
+
+        failures = self.failures.get(source_id, 0)
+        if failures:
+            base = min(base * 2 ** failures, POLL_MAX_INTERVAL * 60)
+
+        return base * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+
+    @staticmethod
+    async def cadence(source_id: int, db: AsyncSession) -> Optional[float]:
+        """Half the median gap between recent articles, in seconds.
+
+        Polling at half the publish interval keeps the expected detection
+        delay well under one publish period. Returns None without enough
+        history.
+        """
+        stamps = (await db.scalars(
+            select(Article.timestamp)
+            .where(Article.source_id == source_id, Article.timestamp != None)
+            .order_by(Article.timestamp.desc())
+            .limit(POLL_HISTORY_SIZE)
+        )).all()
+        gaps = [
+            (newer - older).total_seconds()
+            for newer, older in zip(stamps, stamps[1:])
+            if newer > older
+        ]
+        if len(gaps) < 2:
+            return None
+        # Idle time since the last article also counts: a feed that went
+        # quiet drifts towards the slow end instead of being hammered
+        since_last = (datetime.utcnow() - stamps[0]).total_seconds()
+        gap = max(statistics.median(gaps), min(since_last, POLL_MAX_INTERVAL * 60))
+        return gap / 2
+
+    def stats(self) -> list:
+        result = []
+        for job in self.scheduler.get_jobs():
+            if not job.id.startswith("rss_source_"):
+                continue
+            source_id = job.args[0]
+            result.append({
+                "source_id": source_id,
+                "next_poll": job.next_run_time.isoformat() if job.next_run_time else None,
+                "interval_seconds": round(self.intervals[source_id]) if source_id in self.intervals else None,
+                "failures": self.failures.get(source_id, 0),
+            })
+        return sorted(result, key=lambda r: r["source_id"])
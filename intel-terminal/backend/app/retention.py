@@ -0,0 +1,140 @@
+"""Article retention: archive old rows, keep rollups and dedup keys.
+
+Articles older than ``RETENTION_DAYS`` are moved out of ``articles`` in
+small batches, each in its own short write transaction:
+
+1. the full rows are appended to gzipped JSONL segments in
+   ``ARCHIVE_DIR`` (one file per publish day),
+2. per-day counts are added to ``article_rollups``,
+3. a 64-bit key of ``article_hash`` goes into ``archived_hashes`` so the
+   article is still recognized as a duplicate if its feed repeats it,
+4. the rows are deleted (the FTS triggers drop them from the search
+   index) and the dashboard counters are decremented.
+
+Segments are written before the delete commits, so a crash in between can
+archive a row twice but never loses one.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import ARCHIVE_DIR, RETENTION_BATCH_SIZE, RETENTION_DAYS
+from app.counters import record_removal
+from app.database import SessionLocal, dialect_insert
+from app.dedup import archive_key
+from app.models import ArchivedHash, Article, ArticleRollup
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_COLUMNS = [column.name for column in Article.__table__.columns]
+
+
+def archive_record(article: Article) -> Dict:
+    record = {name: getattr(article, name) for name in ARCHIVE_COLUMNS}
+    for name, value in record.items():
+        if isinstance(value, datetime):
+            record[name] = value.isoformat()
+    return record
+
+
+def write_segments(records: List[Dict], archive_dir: str = ARCHIVE_DIR):
+    """Append records to articles-YYYY-MM-DD.jsonl.gz by publish day.
+
+    Each append adds a gzip member; concatenated members read back as one
+    stream (``gzip.open(path, "rt")``).
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    by_day = defaultdict(list)
+    for record in records:
+        by_day[record["timestamp"][:10]].append(record)
+    for day, day_records in by_day.items():
+        path = os.path.join(archive_dir, f"articles-{day}.jsonl.gz")
+        with gzip.open(path, "at", encoding="utf-8") as f:
+            for record in day_records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+async def add_rollups(db: AsyncSession, articles: List[Article]):
+    counts = Counter()
+    high = Counter()
+    for article in articles:
+        key = (article.timestamp.date(), article.category_id or 0, article.source_id or 0)
+        counts[key] += 1
+        if (article.severity or 0) >= 7:
+            high[key] += 1
+    table = ArticleRollup.__table__
+    stmt = dialect_insert(db, table).values([
+        {"day": day, "category_id": category_id, "source_id": source_id,
+         "count": count, "high_severity": high[(day, category_id, source_id)]}
+        for (day, category_id, source_id), count in counts.items()
+    ])
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=["day", "category_id", "source_id"],
+        set_={
+            "count": table.c.count + stmt.excluded.count,
+            "high_severity": table.c.high_severity + stmt.excluded.high_severity,
+        },
+    ))
+
+
+async def archive_batch(db: AsyncSession, cutoff: datetime,
+                        batch_size: int = RETENTION_BATCH_SIZE) -> int:
+    """Archive up to ``batch_size`` articles older than ``cutoff``; returns how many"""
+    articles = (await db.scalars(
+        select(Article)
+        .where(Article.timestamp < cutoff)
+        .order_by(Article.timestamp, Article.id)
+        .limit(batch_size)
+    )).all()
+    if not articles:
+        return 0
+
+    # File I/O stays off the event loop
+    await asyncio.to_thread(write_segments, [archive_record(a) for a in articles])
+
+    await add_rollups(db, articles)
+    stmt = dialect_insert(db, ArchivedHash.__table__).values(
+        [{"key": key} for key in {archive_key(a.article_hash) for a in articles}]
+    )
+    await db.execute(stmt.on_conflict_do_nothing(index_elements=["key"]))
+    await db.execute(delete(Article).where(Article.id.in_([a.id for a in articles])))
+    await record_removal(db, articles)
+    await db.commit()
+    return len(articles)
+
+
+async def run_retention(days: int = RETENTION_DAYS, batch_size: int = RETENTION_BATCH_SIZE) -> int:
+    """Archive everything past the retention age, one short transaction per batch"""
+    if days <= 0:
+        return 0
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    total = 0
+    db = SessionLocal()
+    try:
+        while True:
+            try:
+                archived = await archive_batch(db, cutoff, batch_size)
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"Retention batch failed: {e}")
+                break
+            total += archived
+            if archived < batch_size:
+                break
+            # Release the writer between batches so ingest can interleave
+            db.expunge_all()
+            await asyncio.sleep(0)
+    finally:
+        await db.close()
+    if total:
+        logger.info(f"Archived {total} articles older than {cutoff:%Y-%m-%d}")
+    return total
@@ -1,107 +1,200 @@
-import feedparser
+import asyncio
 import logging
+from collections import defaultdict
 from datetime import datetime
-from time import mktime
-from sqlalchemy.orm import Session
-from app.models import Article, Source
-from app.websocket import broadcast_article
-from app.utils import generate_article_hash, extract_keywords, sanitize_text
-from app.config import MAX_ARTICLES_PER_FEED
+from typing import Dict, List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import ArchivedHash, Article, Source
+from app.database import SessionLocal, dialect_insert
+from app.counters import record_ingest
+from app.websocket import broadcast_articles, notify_watchlists
+from app.fetcher import FetchResult, get_fetcher
+from app.parsing import ParsedEntry, ParsedFeed
+from app.dedup import archive_key, dedup_cache
+from app.tagging import tagger
+from app.discord import send_discord_alert
+from app.config import DISCORD_MIN_SEVERITY
 
 
-def parse_feed_date(entry):
-    """Extract publication date from RSS entry"""
-    # Try various date fields RSS feeds use
-    for date_field in ['published_parsed', 'updated_parsed', 'created_parsed']:
-        time_struct = entry.get(date_field)
-        if time_struct:
-            try:
-                return datetime.fromtimestamp(mktime(time_struct))
-            except (ValueError, OverflowError):
-                continue
-    # Fallback to current time
-    return datetime.utcnow()
-
 logger = logging.getLogger(__name__)
 
-async def fetch_and_process_feeds(db: Session):
-    """Fetch all enabled sources and process articles"""
-    sources = db.query(Source).filter(Source.enabled == True).all()
+async def fetch_and_process_feeds(db: AsyncSession):
+    """Fetch all enabled sources concurrently and process articles"""
+    sources = (await db.scalars(select(Source).where(Source.enabled == True))).all()
+    # End the read transaction so no pooled connection waits on the network
+    await db.commit()
+    fetcher = get_fetcher()
     
-    for source in sources:
+    async def download(source: Source):
+        logger.info(f"Fetching: {source.name}")
         try:
-            await fetch_source(source, db)
+            return source, await fetch_conditional(fetcher, source)
         except Exception as e:
-            logger.error(f"Error fetching {source.name}: {e}")
+            logger.error(f"Error fetching {source.name}: {e!r}")
+            return source, None
+    
+    # Network + parsing run concurrently; DB writes happen one feed at a
+    # time, in completion order, so the shared session is never interleaved
+    tasks = [asyncio.create_task(download(source)) for source in sources]
+    for next_done in asyncio.as_completed(tasks):
+        source, result = await next_done
+        if result is None:
+            continue
+        name = source.name
+        try:
+            await process_result(source, result, db)
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error processing {name}: {e}")
+            # The rollback expired every loaded Source; reload them in one
+            # query instead of lazy-loading (not possible under asyncio)
+            await db.execute(select(Source).where(Source.enabled == True))
+            await db.commit()
+
+async def fetch_source(source: Source):
+    """Fetch a single RSS source.
 
-async def fetch_source(source: Source, db: Session):
-    """Fetch a single RSS source"""
+    ``source`` may be detached: no session (and so no pooled connection)
+    is held during the network fetch; the result is ingested in a fresh one.
+    """
     logger.info(f"Fetching: {source.name}")
     
-    feed = feedparser.parse(source.rss_url)
+    result = await fetch_conditional(get_fetcher(), source)
+    async with SessionLocal() as db:
+        await process_result(await db.merge(source, load=False), result, db)
+
+async def fetch_conditional(fetcher, source: Source) -> FetchResult:
+    """Fetch a source using the cache validators stored from its last poll"""
+    return await fetcher.fetch_feed(
+        source.rss_url,
+        etag=source.etag,
+        last_modified=source.last_modified,
+        content_hash=source.content_hash,
+    )
+
+async def process_result(source: Source, result: FetchResult, db: AsyncSession):
+    """Ingest a fetch result in one transaction, then broadcast new articles.
+
+    The source's cache validators are committed together with the entries,
+    so a failed ingest is retried in full on the next poll instead of
+    getting a 304.
+    """
+    new_articles = {}
+    if result.unchanged:
+        logger.debug(f"Not modified: {source.name}")
+    else:
+        new_articles = await ingest_feed(source, result.feed, db)
     
-    if feed.bozo:
-        logger.warning(f"Feed error for {source.name}: {feed.bozo_exception}")
+    source.etag = result.etag
+    source.last_modified = result.last_modified
+    source.content_hash = result.content_hash
+    await db.commit()
+    dedup_cache.add_many(new_articles)
     
-    # Process latest articles
-    for entry in feed.entries[:MAX_ARTICLES_PER_FEED]:
-        try:
-            title = sanitize_text(entry.get("title", "No title"))
-            link = entry.get("link", "")
-            description = sanitize_text(entry.get("summary", ""))
-            
-            if not title or not link:
-                continue
-            
-            # Generate hash for deduplication
-            article_hash = generate_article_hash(title, link)
-            
-            # Check if article already exists
-            existing = db.query(Article).filter(
-                Article.article_hash == article_hash
-            ).first()
-            
-            if existing:
-                logger.debug(f"Duplicate article: {title[:50]}")
-                continue
-            
-            # Extract tags and severity
-            tags, severity = extract_keywords(title)
-            
-            # Get actual publication date from feed
-            published_time = parse_feed_date(entry)
-            
-            # Create article
-            article = Article(
-                title=title,
-                link=link,
-                description=description,
-                source_id=source.id,
-                source_name=source.name,
-                category_id=source.category_id,
-                tags=",".join(tags),
-                severity=severity,
-                article_hash=article_hash,
-                timestamp=published_time
-            )
-            
-            db.add(article)
-            db.commit()
-            
-            # Broadcast to WebSocket clients
-            await broadcast_article({
-                "id": article.id,
-                "source": source.name,
-                "source_color": source.color,
-                "title": title,
-                "link": link,
-                "tags": tags,
-                "severity": severity,
-                "timestamp": article.timestamp.isoformat() + "Z",
-                "category": source.category_id
-            })
-            
-            logger.info(f"New article: {title[:50]}")
-            
-        except Exception as e:
-            logger.error(f"Error processing article from {source.name}: {e}")
+    # Broadcast to WebSocket clients only once the rows are durable
+    matches = defaultdict(list)
+    for article in new_articles.values():
+        logger.info(f"New article: {article['title'][:50]}")
+        # Watchlist hits are per-user, never part of the public payload
+        for user_id in article.pop("watchlists"):
+            matches[user_id].append(article)
+    if new_articles:
+        await broadcast_articles(list(new_articles.values()))
+    if matches:
+        await notify_watchlists(matches)
+    for article in new_articles.values():
+        if article["severity"] >= DISCORD_MIN_SEVERITY:
+            await send_discord_alert(article["title"], article["link"], source.name, article["severity"])
+
+def build_article_row(source: Source, entry: ParsedEntry) -> Dict:
+    """Turn a normalized feed entry into an ``articles`` row"""
+    return {
+        "title": entry.title,
+        "link": entry.link,
+        "description": entry.description,
+        "source_id": source.id,
+        "source_name": source.name,
+        "category_id": source.category_id,
+        "tags": "",
+        "severity": 0,
+        "article_hash": entry.article_hash,
+        "timestamp": entry.timestamp,
+        "fetched_at": datetime.utcnow(),
+    }
+
+async def insert_articles(db: AsyncSession, rows: List[Dict]) -> Dict[str, int]:
+    """Bulk INSERT ... ON CONFLICT DO NOTHING; returns {article_hash: id} of inserted rows"""
+    table = Article.__table__
+    stmt = (
+        dialect_insert(db, table)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["article_hash"])
+        .returning(table.c.id, table.c.article_hash)
+    )
+    return {article_hash: article_id for article_id, article_hash in await db.execute(stmt)}
+
+async def ingest_feed(source: Source, feed: ParsedFeed, db: AsyncSession) -> Dict[str, Dict]:
+    """Stage new entries from a parsed feed without committing.
+
+    Hashes not answered by the dedup cache are resolved with a single
+    IN (...) query and the new rows are written with one bulk insert.
+    Returns {article_hash: broadcast payload} for the rows actually inserted;
+    each payload also carries the ids of users whose watchlists matched.
+    """
+    if feed.error:
+        logger.warning(f"Feed error for {source.name}: {feed.error}")
+    
+    # De-duplicate within the feed itself
+    rows = {}
+    for entry in feed.entries:
+        rows.setdefault(entry.article_hash, build_article_row(source, entry))
+    
+    if not rows:
+        return {}
+    
+    # Recently seen hashes are answered from memory; only the rest hit the DB
+    seen, _, unknown = dedup_cache.partition(rows)
+    existing = set(seen)
+    if unknown:
+        stored = set(await db.scalars(
+            select(Article.article_hash).where(Article.article_hash.in_(unknown))
+        ))
+        # Articles moved to the archive only left a 64-bit key behind
+        keys = {archive_key(h): h for h in unknown if h not in stored}
+        if keys:
+            stored.update(keys[key] for key in await db.scalars(
+                select(ArchivedHash.key).where(ArchivedHash.key.in_(keys))
+            ))
+        dedup_cache.add_many(stored)
+        existing |= stored
+    new_rows = [row for article_hash, row in rows.items() if article_hash not in existing]
+    if not new_rows:
+        return {}
+    
+    # One keyword scan per new article: tags, severity and watchlist hits
+    watchlists = {}
+    for row in new_rows:
+        result = tagger.scan(row["title"], row["description"])
+        row["tags"] = ",".join(result.tags)
+        row["severity"] = result.severity
+        watchlists[row["article_hash"]] = result.watchlists
+    
+    inserted = await insert_articles(db, new_rows)
+    await record_ingest(db, [row for row in new_rows if row["article_hash"] in inserted])
+    return {
+        row["article_hash"]: {
+            "id": inserted[row["article_hash"]],
+            "source": source.name,
+            "source_color": source.color,
+            "title": row["title"],
+            "link": row["link"],
+            "tags": row["tags"].split(",") if row["tags"] else [],
+            "severity": row["severity"],
+            "timestamp": row["timestamp"].isoformat() + "Z",
+            "category": source.category_id,
+            "watchlists": watchlists[row["article_hash"]]
+        }
+        for row in new_rows
+        if row["article_hash"] in inserted
+    }
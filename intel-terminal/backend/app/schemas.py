@@ -64,8 +64,9 @@ class ArticleResponse(BaseModel):
 class ArticleSearchRequest(BaseModel):
     query: str
     category: Optional[str] = None
-    severity: Optional[str] = None
+    severity: Optional[str] = None  # high, medium or low
     limit: int = 20
+    offset: int = 0
 
 
 # ===== SOURCE SCHEMAS =====
@@ -0,0 +1,152 @@
+"""Full-text search over article title, description and tags.
+
+SQLite uses an external-content FTS5 table kept in sync by triggers, so
+every article insert (or delete) updates the index in the same
+transaction. PostgreSQL uses a stored generated ``tsvector`` column with
+a GIN index. Without either, search falls back to a LIKE scan.
+"""
+
+import logging
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import column, func, literal_column, or_, select, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Article
+
+logger = logging.getLogger(__name__)
+
+# bm25 column weights: title, description, tags
+FTS_WEIGHTS = (10.0, 3.0, 5.0)
+
+# API severity label -> (min, max) on the 0-10 Article.severity scale
+SEVERITY_RANGES = {
+    "high": (7, 10),
+    "medium": (4, 6),
+    "low": (0, 3),
+}
+
+articles_fts = table("articles_fts", column("rowid"), column("articles_fts"), column("rank"))
+
+SQLITE_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        title, description, tags,
+        content='articles', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts(rowid, title, description, tags)
+        VALUES (new.id, new.title, new.description, new.tags);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, description, tags)
+        VALUES ('delete', old.id, old.title, old.description, old.tags);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, description, tags)
+        VALUES ('delete', old.id, old.title, old.description, old.tags);
+        INSERT INTO articles_fts(rowid, title, description, tags)
+        VALUES (new.id, new.title, new.description, new.tags);
+    END""",
+]
+
+POSTGRES_FTS_DDL = [
+    """ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(tags, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS idx_articles_search ON articles USING GIN (search_vector)",
+]
+
+# Set by ensure_search_index(): "fts5", "tsvector" or "like"
+backend = "like"
+
+
+def ensure_search_index(conn: Connection):
+    """Create the full-text index for this backend (run from init_db)"""
+    global backend
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        for ddl in POSTGRES_FTS_DDL:
+            conn.execute(text(ddl))
+        backend = "tsvector"
+    elif dialect == "sqlite":
+        is_new = not conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE name = 'articles_fts'"
+        )).first()
+        try:
+            for ddl in SQLITE_FTS_DDL:
+                conn.execute(text(ddl))
+        except OperationalError as e:
+            logger.warning(f"SQLite FTS5 unavailable, search falls back to LIKE: {e}")
+            return
+        conn.execute(text(
+            "INSERT INTO articles_fts(articles_fts, rank) VALUES ('rank', :rank)"
+        ), {"rank": "bm25(%s)" % ", ".join(str(w) for w in FTS_WEIGHTS)})
+        if is_new:
+            # Index articles stored before search existed
+            conn.execute(text("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')"))
+            logger.info("Built articles full-text index")
+        backend = "fts5"
+    logger.info(f"Article search backend: {backend}")
+
+
+def terms(query: str) -> List[str]:
+    return re.findall(r"\w+", query.lower())
+
+
+def fts5_query(words: List[str]) -> str:
+    """Quote every term (user input is never FTS syntax); prefix-match the last"""
+    quoted = ['"%s"' % word for word in words]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+async def search_articles(db: AsyncSession, query: str, category_id: Optional[int] = None,
+                          severity: Optional[str] = None, limit: int = 20,
+                          offset: int = 0) -> List[Tuple[Article, float]]:
+    """Matching articles, best match first, as (article, score) pairs"""
+    words = terms(query)
+    if not words:
+        return []
+
+    if backend == "fts5":
+        score = -articles_fts.c.rank  # bm25: lower is better
+        stmt = (
+            select(Article, score)
+            .join(articles_fts, articles_fts.c.rowid == Article.id)
+            .where(articles_fts.c.articles_fts.op("MATCH")(fts5_query(words)))
+            .order_by(articles_fts.c.rank, Article.id.desc())
+        )
+    elif backend == "tsvector":
+        vector = literal_column("articles.search_vector")
+        tsquery = func.websearch_to_tsquery("english", query)
+        score = func.ts_rank_cd(vector, tsquery)
+        stmt = (
+            select(Article, score)
+            .where(vector.op("@@")(tsquery))
+            .order_by(score.desc(), Article.id.desc())
+        )
+    else:
+        stmt = select(Article, literal_column("0.0"))
+        for word in words:
+            pattern = f"%{word}%"
+            stmt = stmt.where(or_(
+                Article.title.ilike(pattern),
+                Article.description.ilike(pattern),
+                Article.tags.ilike(pattern),
+            ))
+        stmt = stmt.order_by(Article.timestamp.desc(), Article.id.desc())
+
+    if category_id is not None:
+        stmt = stmt.where(Article.category_id == category_id)
+    if severity in SEVERITY_RANGES:
+        low, high = SEVERITY_RANGES[severity]
+        stmt = stmt.where(Article.severity.between(low, high))
+
+    rows = await db.execute(stmt.limit(limit).offset(offset))
+    return [(article, float(score or 0)) for article, score in rows]
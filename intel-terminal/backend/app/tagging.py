@@ -0,0 +1,269 @@
+"""Keyword tagging: severity keywords and user watchlists in one regex.
+
+Every keyword (global severity keywords and all users' watchlist
+keywords) is compiled into a single alternation with word boundaries, so
+title and description are scanned once per article no matter how many
+keywords exist. Each keyword maps to its tags, severity score and the
+ids of the users watching it.
+
+Severity keywords come from ``KEYWORDS_FILE`` (JSON ``{"keyword": score}``)
+when set, else ``DEFAULT_SEVERITY_KEYWORDS``; the file is re-read when its
+mtime changes. Watchlists come from ``User.keywords``; a changed user
+only touches their own entries in the keyword -> users index.
+"""
+
+import json
+import logging
+import os
+import re
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import KEYWORDS_FILE
+from app.database import SessionLocal
+from app.models import User
+
+logger = logging.getLogger(__name__)
+
+# Keyword -> severity (0-10). Scores follow the V2 roadmap tiers:
+# critical 9-10, high 7-8, medium 4-6
+DEFAULT_SEVERITY_KEYWORDS = {
+    "critical": 10,
+    "zero-day": 10,
+    "0day": 10,
+    "exploit": 9,
+    "exploited": 9,
+    "ransomware": 9,
+    "nation-state": 9,
+    "apt group": 9,
+    "advanced persistent threat": 9,
+    "breach": 8,
+    "vulnerability": 8,
+    "backdoor": 8,
+    "compromised": 8,
+    "attack": 7,
+    "malware": 7,
+    "cve": 7,
+    "hack": 7,
+    "hacked": 7,
+    "alert": 6,
+    "warning": 5,
+    "threat": 5,
+    "advisory": 5,
+    "patch": 4,
+    "risk": 4,
+}
+
+
+# Optional inflection after a keyword: "breaches", "attacks", "exploiting";
+# keywords ending in "y" also match "-ies" / "-ied" ("vulnerabilities")
+INFLECTION = r"(?:s|es|ed|ing)?"
+INFLECTION_SUFFIXES = (("ies", "y"), ("ied", "y"), ("ing", ""), ("es", ""), ("ed", ""), ("s", ""))
+
+
+def keyword_regex(word: str) -> str:
+    if word.endswith("y") and len(word) > 2:
+        return re.escape(word[:-1]) + "(?:y|ies|ied)"
+    return re.escape(word)
+
+
+def normalize_keywords(words: Iterable[str]) -> List[str]:
+    return sorted({word.strip().lower() for word in words if word and word.strip()})
+
+
+class TagResult(NamedTuple):
+    tags: List[str]
+    severity: int
+    watchlists: FrozenSet[int]  # ids of users whose keywords matched
+
+
+class KeywordTagger:
+    """Single-pass matcher for severity keywords plus per-user watchlists.
+
+    ``index`` is the inverted watchlist index (keyword -> user ids). It is
+    updated per user; the regex is only recompiled when the union of
+    keywords actually changes, not when users merely share existing ones.
+    """
+
+    def __init__(self, severity_keywords: Dict[str, int] = None,
+                 watchlists: Dict[int, Iterable[str]] = None):
+        self.severity_keywords: Dict[str, int] = {}
+        self.watchlists: Dict[int, List[str]] = {}
+        self.index: Dict[str, Set[int]] = {}
+        self.pattern: Optional[re.Pattern] = None
+        self.vocabulary: FrozenSet[str] = frozenset()
+        # keyword -> (tags, severity, keywords whose watchers it notifies)
+        self.keywords: Dict[str, Tuple[Tuple[str, ...], int, Tuple[str, ...]]] = {}
+        # matched text -> keyword, for matches that don't lower() to their keyword
+        self.aliases: Dict[str, Optional[str]] = {}
+        self.update(severity_keywords or DEFAULT_SEVERITY_KEYWORDS, watchlists or {})
+
+    def update(self, severity_keywords: Dict[str, int] = None,
+               watchlists: Dict[int, Iterable[str]] = None):
+        """Replace either keyword set wholesale"""
+        if severity_keywords is not None:
+            self.severity_keywords = {k.strip().lower(): int(v) for k, v in severity_keywords.items() if k.strip()}
+        if watchlists is not None:
+            self.watchlists = {}
+            self.index = {}
+            for user_id, words in watchlists.items():
+                self._index_user(user_id, normalize_keywords(words))
+        self.compile()
+
+    def _index_user(self, user_id: int, words: List[str]):
+        for word in self.watchlists.pop(user_id, ()):
+            users = self.index.get(word)
+            if users is not None:
+                users.discard(user_id)
+                if not users:
+                    del self.index[word]
+        if words:
+            self.watchlists[user_id] = words
+            for word in words:
+                self.index.setdefault(word, set()).add(user_id)
+
+    def set_user_keywords(self, user_id: int, words: Iterable[str]) -> bool:
+        """Incrementally replace one user's watchlist; True if it changed"""
+        words = normalize_keywords(words)
+        if self.watchlists.get(user_id, []) == words:
+            return False
+        self._index_user(user_id, words)
+        if self.vocabulary != frozenset(self.severity_keywords) | frozenset(self.index):
+            self.compile()
+        return True
+
+    def remove_user(self, user_id: int) -> bool:
+        return self.set_user_keywords(user_id, [])
+
+    def compile(self):
+        keywords = frozenset(self.severity_keywords) | frozenset(self.index)
+        self.vocabulary = keywords
+        self.aliases = {}
+        if not keywords:
+            self.pattern = None
+            self.keywords = {}
+            return
+        # Longest first so "zero-day" wins over a shorter overlapping keyword
+        alternation = "|".join(keyword_regex(word) for word in sorted(keywords, key=lambda w: (-len(w), w)))
+        self.pattern = re.compile(rf"(?<!\w)(?:{alternation}){INFLECTION}(?!\w)", re.IGNORECASE)
+
+        # Matches don't overlap, so a phrase also carries the tags and
+        # watchers of every keyword inside it ("cisco ios" implies "cisco")
+        self.keywords = {}
+        for word in keywords:
+            contained = [word]
+            if re.search(r"\W", word):
+                contained += [k for k in keywords if k != word
+                              and re.search(rf"(?<!\w){re.escape(k)}(?!\w)", word)]
+            tags = tuple(k.upper() for k in contained if k in self.severity_keywords)
+            severity = max((self.severity_keywords[k] for k in contained if k in self.severity_keywords), default=0)
+            self.keywords[word] = (tags, severity, tuple(contained))
+        logger.info(f"Compiled tagger: {len(self.severity_keywords)} severity keywords, "
+                    f"{len(self.index)} watched keywords, {len(self.watchlists)} watchlists")
+
+    def _resolve(self, text: str) -> Optional[str]:
+        """Keyword a match stands for.
+
+        Inflected matches ("breaches") map back by stripping the suffix.
+        Under IGNORECASE "İstanbul" matches "istanbul" and "ranſomware"
+        matches "ransomware", but lower() gives "i̇stanbul" / "ranſomware";
+        those rare spellings are resolved once by full-matching each keyword.
+        """
+        word = text.lower()
+        if word in self.keywords:
+            return word
+        for suffix, replacement in INFLECTION_SUFFIXES:
+            if word.endswith(suffix) and word[:-len(suffix)] + replacement in self.keywords:
+                return word[:-len(suffix)] + replacement
+        if text not in self.aliases:
+            if len(self.aliases) >= 10000:
+                self.aliases = {}
+            self.aliases[text] = next(
+                (k for k in self.keywords
+                 if re.fullmatch(keyword_regex(k) + INFLECTION, text, re.IGNORECASE)), None
+            )
+        return self.aliases[text]
+
+    def scan(self, title: str, description: str = "") -> TagResult:
+        """Tags (severity keywords, upper-cased), max severity and matching watchlists"""
+        if self.pattern is None:
+            return TagResult([], 0, frozenset())
+        tags: List[str] = []
+        severity = 0
+        users: Set[int] = set()
+        seen = set()
+        text = f"{title}\n{description}" if description else title
+        for match in self.pattern.finditer(text):
+            word = self._resolve(match.group(0))
+            if word is None or word in seen:
+                continue
+            seen.add(word)
+            word_tags, word_severity, notifies = self.keywords[word]
+            tags.extend(tag for tag in word_tags if tag not in tags)
+            severity = max(severity, word_severity)
+            for keyword in notifies:
+                users |= self.index.get(keyword, set())
+        return TagResult(tags, severity, frozenset(users))
+
+
+class KeywordFile:
+    """Re-reads KEYWORDS_FILE into a tagger when the file changes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.mtime: Optional[float] = None
+
+    def reload_if_changed(self, target: KeywordTagger) -> bool:
+        if not self.path:
+            return False
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return False
+        if mtime == self.mtime:
+            return False
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                keywords = json.load(f)
+            target.update(severity_keywords=keywords)
+        except (OSError, ValueError, AttributeError) as e:
+            logger.error(f"Could not load keywords from {self.path}: {e}")
+            return False
+        finally:
+            self.mtime = mtime
+        logger.info(f"Loaded {len(keywords)} severity keywords from {self.path}")
+        return True
+
+
+tagger = KeywordTagger()
+keyword_file = KeywordFile(KEYWORDS_FILE)
+keyword_file.reload_if_changed(tagger)
+
+
+async def load_watchlists(db: AsyncSession) -> int:
+    """Sync watchlists of users with alerts enabled; returns how many changed"""
+    rows = await db.execute(
+        select(User.id, User.keywords).where(User.alerts_enabled == True)
+    )
+    watchlists = {user_id: keywords or [] for user_id, keywords in rows}
+    changed = sum(
+        tagger.set_user_keywords(user_id, keywords)
+        for user_id, keywords in watchlists.items()
+    )
+    changed += sum(
+        tagger.remove_user(user_id)
+        for user_id in list(tagger.watchlists) if user_id not in watchlists
+    )
+    return changed
+
+
+async def reload_keywords():
+    """Scheduled job: pick up keyword file and watchlist changes"""
+    keyword_file.reload_if_changed(tagger)
+    db = SessionLocal()
+    try:
+        await load_watchlists(db)
+    finally:
+        await db.close()
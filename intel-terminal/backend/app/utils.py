@@ -1,35 +1,25 @@
 import hashlib
+import html
+import re
 from datetime import datetime
 
+from app.config import SANITIZE_HTML_PARSER
+
+_TAG_RE = re.compile(r"<[^>]*>")
+_PARTIAL_TAG_RE = re.compile(r"<[^>]*$")
+_DROP_RE = re.compile(r"<(script|style)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+
 def generate_article_hash(title: str, link: str) -> str:
     """Generate SHA256 hash for deduplication"""
     content = f"{title}{link}".encode()
     return hashlib.sha256(content).hexdigest()
 
-def extract_keywords(title: str) -> list:
-    """Simple keyword extraction for tagging"""
-    # Keywords that indicate severity
-    severity_words = {
-        "critical": 10,
-        "exploit": 9,
-        "ransomware": 9,
-        "breach": 8,
-        "vulnerability": 8,
-        "attack": 7,
-        "alert": 6,
-        "warning": 5,
-    }
-
-    title_lower = title.lower()
-    severity = 0
-    tags = []
-
-    for word, score in severity_words.items():
-        if word in title_lower:
-            severity = max(severity, score)
-            tags.append(word.upper())
-
-    return tags, severity
+def extract_keywords(title: str, description: str = "") -> tuple:
+    """Tags and severity from the shared keyword tagger (see app.tagging)"""
+    from app.tagging import tagger
+
+    result = tagger.scan(title, description)
+    return result.tags, result.severity
 
 def format_timestamp(dt: datetime) -> str:
     """Format datetime for IRC-style display"""
@@ -37,18 +27,68 @@ def format_timestamp(dt: datetime) -> str:
         return "[??:??]"
     return f"[{dt.strftime('%H:%M')}]"
 
-def sanitize_text(text: str) -> str:
-    """Remove HTML and dangerous characters from RSS content"""
+def _strip_tags_regex(text: str) -> str:
+    if "<s" in text or "<S" in text:
+        text = _DROP_RE.sub(" ", text)
+    return _TAG_RE.sub(" ", text)
+
+def _selectolax_strip_tags():
+    try:
+        from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    except ImportError:
+        from selectolax.parser import HTMLParser
+
+    def strip_tags(text: str) -> str:
+        tree = HTMLParser(text)
+        for node in tree.css("script, style"):
+            node.decompose()
+        return tree.text(separator=" ")
+    return strip_tags
+
+def _lxml_strip_tags():
+    import lxml.html
+    from lxml.etree import ParserError
+
+    def strip_tags(text: str) -> str:
+        try:
+            root = lxml.html.fragment_fromstring(text, create_parent="div")
+        except (ParserError, ValueError):
+            return _strip_tags_regex(text)
+        for node in root.xpath("//script|//style"):
+            node.drop_tree()
+        return " ".join(root.itertext())
+    return strip_tags
+
+def _load_html_backend(name: str):
+    """Tag stripper for SANITIZE_HTML_PARSER; falls back to regex if not installed"""
+    loaders = {"selectolax": _selectolax_strip_tags, "lxml": _lxml_strip_tags}
+    candidates = list(loaders) if name == "auto" else [name]
+    for candidate in candidates:
+        if candidate in loaders:
+            try:
+                return candidate, loaders[candidate]()
+            except ImportError:
+                continue
+    return "regex", _strip_tags_regex
+
+HTML_BACKEND, _strip_tags = _load_html_backend(SANITIZE_HTML_PARSER)
+
+def sanitize_text(text: str, max_length: int = None) -> str:
+    """Turn RSS HTML into plain text.
+
+    Drops tags (and script/style bodies), decodes all HTML entities,
+    collapses whitespace and truncates to ``max_length`` characters.
+    """
     if not text:
         return ""
-    
-    # Remove HTML tags
-    import re
-    text = re.sub(r'<[^>]+>', '', text)
-    
-    # Escape special characters
-    text = text.replace("&lt;", "<").replace("&gt;", ">")
-    text = text.replace("&quot;", '"').replace("&#39;", "'")
-    text = text.replace("&amp;", "&")
-    
-    return text.strip()
+    if max_length and len(text) > max_length * 8:
+        # Full-content feeds: don't process markup that would be cut anyway
+        text = _PARTIAL_TAG_RE.sub("", text[:max_length * 8])
+    if "<" in text:
+        text = _strip_tags(text)
+    if "&" in text:
+        text = html.unescape(text)
+    text = " ".join(text.split())
+    if max_length and len(text) > max_length:
+        text = text[:max_length - 1].rstrip() + "\u2026"
+    return text
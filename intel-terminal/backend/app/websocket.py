@@ -1,38 +1,153 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import List, Dict
+from typing import Dict, Iterable, List, Optional, Set
+import asyncio
 import json
 import logging
+from app.auth import decode_token
+from app.config import WS_BATCH_SIZE, WS_BATCH_WINDOW, WS_QUEUE_SIZE, WS_SEND_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+class ClientConnection:
+    """A connected socket with its own bounded outbound queue and writer task"""
+
+    def __init__(self, websocket: WebSocket, user_id: Optional[int] = None,
+                 queue_size: int = WS_QUEUE_SIZE):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.writer: Optional[asyncio.Task] = None
+
+    async def run_writer(self, manager: "ConnectionManager"):
+        """Drain the queue to the socket; a stuck or broken client is dropped"""
+        try:
+            while True:
+                text = await self.queue.get()
+                await asyncio.wait_for(self.websocket.send_text(text), WS_SEND_TIMEOUT)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Dropping WebSocket client: {e!r}")
+            await manager.drop(self.websocket)
+
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Dict[WebSocket, ClientConnection] = {}
+        self.by_user: Dict[int, Set[WebSocket]] = {}
+        self.dropped = 0
 
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket, user_id: Optional[int] = None):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        client = ClientConnection(websocket, user_id)
+        client.writer = asyncio.create_task(client.run_writer(self))
+        self.active_connections[websocket] = client
+        if user_id is not None:
+            self.by_user.setdefault(user_id, set()).add(websocket)
         logger.info(f"Client connected. Total: {len(self.active_connections)}")
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        client = self.active_connections.pop(websocket, None)
+        if client is None:
+            return
+        if client.user_id is not None:
+            sockets = self.by_user.get(client.user_id, set())
+            sockets.discard(websocket)
+            if not sockets:
+                self.by_user.pop(client.user_id, None)
+        if client.writer is not asyncio.current_task():
+            client.writer.cancel()
         logger.info(f"Client disconnected. Total: {len(self.active_connections)}")
 
+    async def drop(self, websocket: WebSocket):
+        """Disconnect a slow or broken client and close its socket"""
+        if websocket not in self.active_connections:
+            return
+        self.dropped += 1
+        self.disconnect(websocket)
+        try:
+            await asyncio.wait_for(websocket.close(code=1013), WS_SEND_TIMEOUT)
+        except Exception:
+            pass
+
     async def broadcast(self, message: Dict):
-        """Broadcast message to all connected clients"""
-        for connection in self.active_connections:
+        """Broadcast message to all connected clients.
+
+        The message is serialized once and queued for every client; this
+        never waits on a socket. Clients whose queue is full are dropped.
+        """
+        self.enqueue(json.dumps(message), list(self.active_connections))
+
+    async def send_to_users(self, user_ids: Iterable[int], message: Dict):
+        """Queue a message only for the connections of the given users"""
+        sockets = [ws for user_id in user_ids for ws in self.by_user.get(user_id, ())]
+        if sockets:
+            self.enqueue(json.dumps(message), sockets)
+
+    def enqueue(self, text: str, sockets: List[WebSocket]):
+        for websocket in sockets:
+            client = self.active_connections.get(websocket)
+            if client is None:
+                continue
             try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Broadcast error: {e}")
+                client.queue.put_nowait(text)
+            except asyncio.QueueFull:
+                logger.warning("WebSocket client outbound queue full, dropping client")
+                asyncio.create_task(self.drop(websocket))
+
+class ArticleBatcher:
+    """Coalesces new articles into ``{"type": "articles", "data": [...]}`` frames.
+
+    A batch is flushed when it reaches ``max_size`` or ``window`` seconds
+    after its first article, whichever comes first.
+    """
+
+    def __init__(self, manager: ConnectionManager, window: float = WS_BATCH_WINDOW,
+                 max_size: int = WS_BATCH_SIZE):
+        self.manager = manager
+        self.window = window
+        self.max_size = max_size
+        self.pending: List[Dict] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def add(self, articles: List[Dict]):
+        self.pending.extend(articles)
+        if len(self.pending) >= self.max_size:
+            await self.flush()
+        elif self.pending and self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._flush_task = asyncio.create_task(self.flush())
+
+    async def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self.pending = self.pending, []
+        for start in range(0, len(batch), self.max_size):
+            await self.manager.broadcast({
+                "type": "articles",
+                "data": batch[start:start + self.max_size]
+            })
 
 manager = ConnectionManager()
+article_batcher = ArticleBatcher(manager)
 
 @router.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+async def websocket_endpoint(websocket: WebSocket, token: Optional[str] = None):
+    """Public article feed; with ``?token=<JWT>`` also the user's watchlist alerts"""
+    user_id = None
+    if token:
+        subject = decode_token(token)
+        if subject is None or not str(subject).isdigit():
+            await websocket.close(code=1008)
+            return
+        user_id = int(subject)
+    await manager.connect(websocket, user_id)
     try:
         while True:
             # Keep connection alive and listen for messages
@@ -45,11 +160,20 @@ async def websocket_endpoint(websocket: WebSocket):
         manager.disconnect(websocket)
 
 async def broadcast_article(article_dict: Dict):
-    """Broadcast new article to all clients"""
-    await manager.broadcast({
-        "type": "article",
-        "data": article_dict
-    })
+    """Queue a new article for the next batched broadcast"""
+    await article_batcher.add([article_dict])
+
+async def broadcast_articles(articles: List[Dict]):
+    """Queue several new articles for the next batched broadcast"""
+    await article_batcher.add(articles)
+
+async def notify_watchlists(matches: Dict[int, List[Dict]]):
+    """Send each user the new articles that matched their watchlist"""
+    for user_id, articles in matches.items():
+        await manager.send_to_users([user_id], {
+            "type": "watchlist",
+            "data": articles
+        })
 
 async def broadcast_status(message: str):
     """Broadcast status message"""
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Benchmark for the auth performance layer in app.auth.
+
+Login: N concurrent password checks, inline bcrypt (blocks the event
+loop) vs the bounded thread pool, with the worst event-loop stall seen
+by a 10 ms ticker. Authenticated requests: verify_token throughput
+with and without the verified-token cache.
+
+Usage (from backend/):
+    python benchmarks/auth_bench.py [logins] [requests]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app import auth
+
+
+async def ticker(stop: asyncio.Event) -> float:
+    """Largest gap between 10 ms ticks, i.e. the worst event-loop stall"""
+    worst = 0.0
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(0.01)
+        now = time.perf_counter()
+        worst = max(worst, now - last - 0.01)
+        last = now
+    return worst
+
+
+async def bench_logins(name, check, logins, hashed):
+    stop = asyncio.Event()
+    tick = asyncio.create_task(ticker(stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(check("secret", hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    stall = await tick
+    print(f"  {name:<18} {logins / elapsed:>8.1f} logins/s   max loop stall {stall * 1000:>7.1f} ms")
+
+
+async def inline_verify(password, hashed):
+    return auth.verify_password(password, hashed)
+
+
+async def bench_requests(name, requests, token):
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await auth.verify_token(credentials)
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<18} {requests / elapsed:>10,.0f} requests/s")
+
+
+async def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+    hashed = auth.hash_password("secret")
+
+    print(f"Login ({logins} concurrent, {auth.AUTH_HASH_WORKERS} bcrypt workers, {os.cpu_count()} CPUs):")
+    await bench_logins("inline", inline_verify, logins, hashed)
+    await bench_logins("thread pool", auth.verify_password_async, logins, hashed)
+
+    token = auth.create_access_token({"sub": "1"})
+    print(f"Authenticated requests ({requests}):")
+    auth.token_cache.ttl = 0  # every lookup misses
+    await bench_requests("jwt.decode", requests, token)
+    auth.token_cache.ttl = auth.AUTH_TOKEN_CACHE_TTL
+    auth.token_cache.clear()
+    await bench_requests("token cache", requests, token)
+    auth.shutdown_hash_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,44 @@
+"""Regression checks for app.tagging.KeywordTagger.scan.
+
+Run from backend/:  python test_tagging.py  (or pytest test_tagging.py)
+"""
+
+from app.tagging import KeywordTagger
+
+
+def test_case_insensitive_matches_resolve_to_keyword():
+    tagger = KeywordTagger(watchlists={1: ["istanbul"]})
+    # "İ".lower() is "i̇" (i + combining dot), "ſ" matches "s" under IGNORECASE
+    result = tagger.scan("Explosion reported in İstanbul")
+    assert result.watchlists == frozenset({1})
+    result = tagger.scan("ranſomware gang leaks data")
+    assert "RANSOMWARE" in result.tags
+    assert result.severity == 9
+
+
+def test_phrase_carries_contained_keywords():
+    tagger = KeywordTagger(watchlists={1: ["cisco"], 2: ["cisco ios"]})
+    result = tagger.scan("Critical flaw in Cisco IOS")
+    assert result.watchlists == frozenset({1, 2})
+    assert result.tags == ["CRITICAL"]
+
+
+def test_inflected_forms_match():
+    tagger = KeywordTagger()
+    assert tagger.scan("Data breaches rise").severity == 8
+    assert tagger.scan("New vulnerabilities found").severity == 8
+    result = tagger.scan("Ransomware attacks hospitals")
+    assert "RANSOMWARE" in result.tags and "ATTACK" in result.tags
+
+
+def test_package_manager_apt_is_not_a_threat_actor():
+    result = KeywordTagger().scan("sudo apt upgrade breaks boot")
+    assert result.tags == [] and result.severity == 0
+
+
+if __name__ == "__main__":
+    test_case_insensitive_matches_resolve_to_keyword()
+    test_phrase_carries_contained_keywords()
+    test_inflected_forms_match()
+    test_package_manager_apt_is_not_a_threat_actor()
+    print("ok")
@@ -357,7 +357,9 @@ function connectWebSocket() {
         ws.onmessage = (event) => {
             try {
                 const msg = JSON.parse(event.data);
-                if (msg.type === 'article') {
+                if (msg.type === 'articles') {
+                    addArticles(msg.data);
+                } else if (msg.type === 'article') {
                     addArticle(msg.data);
                 } else if (msg.type === 'status') {
                     console.log('Status:', msg.message);
@@ -551,7 +553,7 @@ function startAutoRefresh() {
         console.log('Auto-refresh enabled: every ' + autoRefreshSeconds + ' seconds');
         autoRefreshInterval = setInterval(() => {
             console.log('Auto-refreshing articles...');
-            loadArticles();
+            loadNewArticles();
         }, autoRefreshSeconds * 1000);
     } else {
         console.log('Auto-refresh disabled');
@@ -561,10 +563,17 @@ function startAutoRefresh() {
 // ========================================
 // Article Management
 // ========================================
+let articlesEtag = null;
+
 async function loadArticles() {
     try {
-        const response = await fetch(API_BASE + '/api/articles?limit=200');
+        const headers = articlesEtag ? { 'If-None-Match': articlesEtag } : {};
+        const response = await fetch(API_BASE + '/api/articles?limit=200', { headers });
+        if (response.status === 304) {
+            return; // Nothing changed since the last load
+        }
         if (response.ok) {
+            articlesEtag = response.headers.get('ETag');
             articles = await response.json();
             updateArticleCount();
             renderArticles();
@@ -574,10 +583,37 @@ async function loadArticles() {
     }
 }
 
+// Fetch only articles stored after the newest one we already hold
+async function loadNewArticles() {
+    const lastId = articles.reduce((max, a) => Math.max(max, a.id || 0), 0);
+    if (lastId === 0) {
+        return loadArticles();
+    }
+    try {
+        const response = await fetch(API_BASE + '/api/articles?limit=200&since_id=' + lastId);
+        if (!response.ok) return;
+        const fresh = await response.json();
+        if (fresh.length === 0) return;
+        if (fresh.length >= 200) {
+            // Too far behind for a delta: reload the full page
+            return loadArticles();
+        }
+        const known = new Set(articles.map(a => a.id));
+        const added = fresh.filter(a => !known.has(a.id));
+        if (added.length > 0) addArticles(added);
+    } catch (error) {
+        console.error('Failed to load new articles:', error);
+    }
+}
+
 function addArticle(article) {
-    // Add to beginning
-    articles.unshift(article);
-    if (articles.length > 1000) articles.pop();
+    addArticles([article]);
+}
+
+function addArticles(batch) {
+    // Add the whole batch to the beginning, then render once
+    articles.unshift(...batch);
+    if (articles.length > 1000) articles.length = 1000;
     updateArticleCount();
     renderArticles();
 }
@@ -27,7 +27,7 @@ from datetime import datetime
 
 # Import the engine from the main script
 sys.path.insert(0, str(Path(__file__).parent))
-from mikrotik_master import MasterEngine
+from mikrotik_master import MasterEngine, DOWNLOAD_QUEUE_SIZE, PROBE_CONCURRENCY, PROBE_RPS, URL_DISCOVERY_MODES
 
 
 class HeadlessLogger:
@@ -50,7 +50,9 @@ class HeadlessLogger:
 class HeadlessController:
     """Controls MikroTik scraper in headless mode"""
     
-    def __init__(self, output_dir, workers=8, retries=3, log_file=None):
+    def __init__(self, output_dir, workers=8, retries=3, log_file=None,
+                 probe_concurrency=PROBE_CONCURRENCY, probe_rps=PROBE_RPS,
+                 queue_size=DOWNLOAD_QUEUE_SIZE, url_discovery='auto'):
         self.output_dir = Path(output_dir)
         self.workers = workers
         self.retries = retries
@@ -62,7 +64,11 @@ class HeadlessController:
             output_dir=str(self.output_dir),
             download_workers=self.workers,
             max_retries=self.retries,
-            gui=self.gui_wrapper
+            gui=self.gui_wrapper,
+            probe_concurrency=probe_concurrency,
+            probe_rps=probe_rps,
+            download_queue_size=queue_size,
+            url_discovery=url_discovery
         )
         
         # Daemon control
@@ -263,46 +269,17 @@ class HeadlessController:
 
     def full_scan(self):
         """Execute a full scan of all available MikroTik versions with parallel download"""
-        from concurrent.futures import ThreadPoolExecutor, as_completed
-        from pathlib import Path
-        
         self.log("=== Starting Full Scan of All Available Versions ===", 'INFO')
         self.check_existing_files()
         self.log(f"Output directory: {self.output_dir}", 'INFO')
         self.log(f"Download workers: {self.workers}", 'INFO')
-        self.log("Scanning versions 3.30.1 to 7.20.x with PARALLEL downloads...", 'INFO')
-        self.log("As versions are found, they'll start downloading immediately", 'INFO')
-        
-        # Generate all candidate versions
-        start_parts = '3.30.1'.split('.')
-        end_parts = '7.20'.split('.')
-        start_major = int(start_parts[0])
-        start_minor = int(start_parts[1]) if len(start_parts) > 1 else 0
-        end_major = int(end_parts[0])
-        end_minor = int(end_parts[1]) if len(end_parts) > 1 else 50
-        
-        all_versions = self.engine.generate_all_version_numbers(start_major, start_minor, end_major, end_minor)
-        self.log(f"Generated {len(all_versions)} candidate versions", 'INFO')
-        
-        # Check versions and download as we find them (parallel)
-        found_count = 0
-        with ThreadPoolExecutor(max_workers=self.workers) as executor:
-            futures = {executor.submit(self.engine.check_version_exists, v): v for v in all_versions}
-            
-            for fut in as_completed(futures):
-                v = futures[fut]
-                try:
-                    if fut.result():
-                        found_count += 1
-                        self.log(f"Found version: {v} - Starting download...", 'FOUND')
-                        # Download immediately in background
-                        executor.submit(self.engine.process_version, v)
-                except Exception:
-                    pass
-        
+        self.log("Discovering versions 3.30 to 7.x (minors, then patches/rc/beta under each)...", 'INFO')
+        self.log("As versions are found, they're queued for the download workers", 'INFO')
+
+        # Probe stage and download pool run as a pipeline inside the engine
+        found_count = self.engine.scan_versions_range_and_download('3.30', '7.99', test_workers=self.workers)
+
         self.log(f"Scan complete - Found and downloaded {found_count} versions", 'SUCCESS')
-        self.engine.save_found_versions()
-        self.engine.save_stats()
 
     def show_versions(self):
         """Display found versions"""
@@ -350,6 +327,15 @@ Examples:
                        help='Maximum retries per file (default: 3)')
     parser.add_argument('--log-file', type=str, default=None,
                        help='Log file path (optional)')
+    parser.add_argument('--probe-rps', type=float, default=PROBE_RPS,
+                       help=f'Max version probe requests per second (default: {PROBE_RPS})')
+    parser.add_argument('--probe-concurrency', type=int, default=PROBE_CONCURRENCY,
+                       help=f'Max version probes in flight (default: {PROBE_CONCURRENCY})')
+    parser.add_argument('--queue-size', type=int, default=DOWNLOAD_QUEUE_SIZE,
+                       help=f'Files queued for download before probing waits (default: {DOWNLOAD_QUEUE_SIZE})')
+    parser.add_argument('--url-discovery', choices=URL_DISCOVERY_MODES, default='auto',
+                       help='How to find files of a version: auto (index listing, else HEAD), '
+                            'head (HEAD every candidate) or guess (GET every candidate) (default: auto)')
     
     group = parser.add_mutually_exclusive_group()
     group.add_argument('--daemon', choices=['start', 'stop', 'status'],
@@ -384,7 +370,11 @@ Examples:
         output_dir=args.output,
         workers=args.workers,
         retries=args.retries,
-        log_file=log_file
+        log_file=log_file,
+        probe_concurrency=args.probe_concurrency,
+        probe_rps=args.probe_rps,
+        queue_size=args.queue_size,
+        url_discovery=args.url_discovery
     )
     
     # Handle daemon commands
@@ -15,14 +15,26 @@ import os
 import re
 import json
 import time
+import asyncio
 import threading
 import queue
 from pathlib import Path
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin
 
 import requests
+
+# Optional: async probing (pip install 'httpx[http2]'); threads are used without it
+try:
+    import httpx
+except ImportError:
+    httpx = None
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 
@@ -52,17 +64,420 @@ FILE_PATTERNS = [
 
 RSS_URL = 'https://mikrotik.com/download.rss'
 
+# Per-version file discovery: the version directory's listing is tried
+# first, then these checksum manifests; the first that parses wins
+INDEX_FILES = ['SHA256SUMS', 'sha256sums.txt', 'MD5SUMS']
+URL_DISCOVERY_MODES = ('auto', 'head', 'guess')
+INDEX_MISS_LIMIT = 3  # versions in a row without an index before auto mode stops asking
+
+HREF_RE = re.compile(r'href="([^"?#/]+)"', re.IGNORECASE)
+CHECKSUM_LINE_RE = re.compile(r'^[0-9a-fA-F]{32,128}\s+\*?(\S+)\s*$', re.MULTILINE)
+
+# Smart discovery: a series (minors of a major, patches / rcN / betaN of a
+# minor) ends after this many consecutive missing numbers
+DISCOVERY_MISS_LIMIT = 3
+# Pre-release numbers are sparse (e.g. 6.45beta54), so they get more slack
+PRERELEASE_MISS_LIMIT = 6
+
+VERSION_RE = re.compile(r'^(\d+)\.(\d+)(?:\.(\d+))?(?:(rc|beta)(\d+))?$')
+
+
+def parse_version(version: str):
+    """Split '7.15.2' / '7.16rc1' into (major, minor, patch, kind, number) or None"""
+    m = VERSION_RE.match(version)
+    if not m:
+        return None
+    major, minor, patch, kind, number = m.groups()
+    return (int(major), int(minor), int(patch) if patch else None, kind, int(number) if number else None)
+
+
+def parse_file_index(text: str):
+    """Filenames from an HTML directory listing or a checksum manifest"""
+    names = set(HREF_RE.findall(text))
+    names.update(os.path.basename(n) for n in CHECKSUM_LINE_RE.findall(text))
+    return names
+
+
+def file_arch(filename: str) -> str:
+    """Architecture named in a filename; files naming none go under x86"""
+    tokens = re.split(r'[-_.]', filename)
+    return next((arch for arch in ARCHITECTURES if arch in tokens), 'x86')
+
+
+def version_key(version: str):
+    """Sort key: 7.16beta1 < 7.16rc1 < 7.16 < 7.16.1"""
+    parsed = parse_version(version)
+    if parsed is None:
+        return (0, 0, 0, 0, 0)
+    major, minor, patch, kind, number = parsed
+    stage = {'beta': 0, 'rc': 1}.get(kind, 2)
+    return (major, minor, stage, patch or 0, number or 0)
+
+
+# Persistent probe cache (probe_cache.jsonl in the output dir). Published
+# versions don't disappear; a miss in an old release line is also final in
+# practice, while misses near the newest release may be filled in soon.
+PROBE_TTL_FOUND = 180 * 86400
+PROBE_TTL_MISSING_OLD = 30 * 86400
+PROBE_TTL_MISSING_RECENT = 6 * 3600
+RECENT_MINORS = 2  # minors below the newest one still treated as recent
+
+# Async prober defaults: in-flight cap, global request rate, connection pool.
+# HTTP/2 multiplexes probes over a few connections; HTTP/1.1 needs one
+# connection per in-flight request.
+PROBE_CONCURRENCY = 1000
+PROBE_RPS = 100
+PROBE_CONNECTIONS = 4 if HTTP2_AVAILABLE else 32
+
+# Download stage: file jobs waiting for a worker before the probe stage blocks
+DOWNLOAD_QUEUE_SIZE = 64
+STATS_INTERVAL = 30  # seconds between pipeline throughput reports
+
+
+class ProbeCache:
+    """Append-only on-disk record of check_version_exists results.
+
+    Each probe is appended as one JSON line ``{"v", "e", "t"}`` and
+    flushed immediately, so a crashed scan resumes without re-probing.
+    The newest line per version wins; the file is compacted on load when
+    it holds mostly superseded lines.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries = {}  # version -> (exists, checked_at)
+        self.lock = threading.Lock()
+        self.newest = (0, 0)  # highest major.minor known to exist
+        self._load()
+
+    def _load(self):
+        lines = 0
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    for line in f:
+                        lines += 1
+                        try:
+                            rec = json.loads(line)
+                            self.entries[rec['v']] = (bool(rec['e']), float(rec['t']))
+                        except (ValueError, KeyError, TypeError):
+                            continue
+            except Exception:
+                pass
+        for version, (exists, _) in self.entries.items():
+            if exists:
+                self.note_found(version)
+        if lines > 2 * len(self.entries) + 1000:
+            self.compact()
+
+    def note_found(self, version: str):
+        parsed = parse_version(version)
+        if parsed:
+            self.newest = max(self.newest, parsed[:2])
+
+    def ttl(self, version: str, exists: bool) -> float:
+        if exists:
+            return PROBE_TTL_FOUND
+        parsed = parse_version(version)
+        if parsed is None:
+            return PROBE_TTL_MISSING_RECENT
+        major, minor = parsed[:2]
+        newest_major, newest_minor = self.newest
+        if (major, minor) >= (newest_major, newest_minor - RECENT_MINORS):
+            return PROBE_TTL_MISSING_RECENT
+        return PROBE_TTL_MISSING_OLD
+
+    def get(self, version: str):
+        """Cached result, or None when unknown or expired"""
+        entry = self.entries.get(version)
+        if entry is None:
+            return None
+        exists, checked_at = entry
+        if time.time() - checked_at > self.ttl(version, exists):
+            return None
+        return exists
+
+    def put(self, version: str, exists: bool):
+        now = time.time()
+        with self.lock:
+            self.entries[version] = (exists, now)
+            if exists:
+                self.note_found(version)
+            try:
+                with open(self.path, 'a') as f:
+                    f.write(json.dumps({'v': version, 'e': exists, 't': round(now)}) + '\n')
+            except Exception:
+                pass
+
+    def compact(self):
+        tmp = self.path.with_suffix('.tmp')
+        with self.lock:
+            try:
+                with open(tmp, 'w') as f:
+                    for version, (exists, checked_at) in self.entries.items():
+                        f.write(json.dumps({'v': version, 'e': exists, 't': round(checked_at)}) + '\n')
+                os.replace(tmp, self.path)
+            except Exception:
+                pass
+
+
+class RateLimiter:
+    """Global requests-per-second limit for every probe of an engine.
+
+    Slots are reserved under a thread lock, so blocking requests in any
+    thread (``wait``) and coroutines on any event loop (``acquire``) draw
+    from the same budget.
+    """
+
+    def __init__(self, rps: float):
+        self.interval = 1.0 / rps if rps > 0 else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Claim the next slot; returns how long to wait for it"""
+        if not self.interval:
+            return 0.0
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        return slot - now
+
+    def wait(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AsyncProber:
+    """Version existence checks on an asyncio event loop.
+
+    With httpx installed, thousands of HEAD probes can be in flight over a
+    handful of keep-alive connections (multiplexed over HTTP/2 when h2 is
+    installed), paced by the engine's RateLimiter. Without httpx the
+    blocking ``check_version_exists`` runs on a thread pool instead. Both
+    paths share the engine's probe caches and rate limit.
+    """
+
+    def __init__(self, engine, concurrency: int = PROBE_CONCURRENCY,
+                 connections: int = PROBE_CONNECTIONS, fallback_workers: int = 12):
+        self.engine = engine
+        self.concurrency = max(1, concurrency)
+        self.connections = max(1, connections)
+        self.fallback_workers = max(1, fallback_workers)
+        self.client = None
+        self.executor = None
+
+    async def __aenter__(self):
+        in_flight = self.concurrency
+        if httpx is not None and not HTTP2_AVAILABLE:
+            # HTTP/1.1 can't multiplex; extra requests would only queue in the pool
+            in_flight = min(in_flight, self.connections)
+        self.semaphore = asyncio.Semaphore(in_flight)
+        self.limiter = self.engine.limiter
+        if httpx is not None:
+            self.client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                # no pool timeout: probes waiting for a stream are not failures
+                timeout=httpx.Timeout(8.0, pool=None),
+                headers={'User-Agent': 'MikroTikScraper/1.0'},
+                limits=httpx.Limits(max_connections=self.connections,
+                                    max_keepalive_connections=self.connections),
+            )
+            self.mode = f"httpx {'HTTP/2' if HTTP2_AVAILABLE else 'HTTP/1.1'}, {self.connections} connections"
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=self.fallback_workers)
+            self.mode = f"{self.fallback_workers} threads (install httpx for async probing)"
+        return self
+
+    async def __aexit__(self, *exc):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    async def exists(self, version: str) -> bool:
+        cached = self.engine.cached_probe(version)
+        if cached is not None:
+            return cached
+        async with self.semaphore:
+            if self.client is None:
+                # check_version_exists waits on the shared limiter itself
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.executor, self.engine.check_version_exists, version)
+            self.engine.increment_stat('versions_tested')
+            self.engine.probe_stats.add('probed')
+            try:
+                await self.limiter.acquire()
+                resp = await self.client.head(f"{BASE_CDN_URL}/{version}/", follow_redirects=True)
+                exists = resp.status_code in (200, 301, 302, 403)
+                if not exists:
+                    await self.limiter.acquire()
+                    resp = await self.client.head(f"{BASE_CDN_URL}/{version}/CHANGELOG")
+                    exists = resp.status_code == 200
+            except httpx.HTTPError:
+                # network errors are not persisted; the next run retries
+                self.engine.version_exists_cache[version] = False
+                return False
+        self.engine.record_probe(version, exists)
+        return exists
+
+    async def url_exists(self, url: str) -> bool:
+        """HEAD a single file URL (used when a version has no index)"""
+        async with self.semaphore:
+            if self.client is None:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.executor, self.engine.head_ok, url)
+            try:
+                await self.limiter.acquire()
+                resp = await self.client.head(url, follow_redirects=True)
+                return resp.status_code == 200
+            except httpx.HTTPError:
+                return False
+
+
+class StageStats:
+    """Thread-safe counters and throughput for one pipeline stage"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.time()
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    def add(self, key: str, amount=1):
+        with self.lock:
+            self.counts[key] = self.counts.get(key, 0) + amount
+
+    def get(self, key: str):
+        return self.counts.get(key, 0)
+
+    def rate(self, key: str) -> float:
+        elapsed = max(time.time() - self.started, 1e-6)
+        return self.get(key) / elapsed
+
+
+class VersionJobs:
+    """Tracks the outstanding file downloads of one version"""
+
+    def __init__(self, version: str, total: int):
+        self.version = version
+        self.remaining = total
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        if total == 0:
+            self.done.set()
+
+    def finish_one(self):
+        with self.lock:
+            self.remaining -= 1
+            if self.remaining <= 0:
+                self.done.set()
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+
+class DownloadPool:
+    """One long-lived set of download workers fed by a bounded queue.
+
+    Jobs are single files. ``submit_version`` blocks while the queue is
+    full, so a producer that is faster than the downloads (the probe
+    stage) is slowed to their pace instead of piling up work.
+    """
+
+    def __init__(self, engine, workers: int, queue_size: int = DOWNLOAD_QUEUE_SIZE):
+        self.engine = engine
+        self.workers = max(1, workers)
+        self.jobs = queue.Queue(maxsize=max(1, queue_size))
+        self.stats = StageStats('download')
+        self.threads = []
+
+    def start(self):
+        if self.threads:
+            return
+        for i in range(self.workers):
+            t = threading.Thread(target=self._worker, name=f'download-{i}', daemon=True)
+            t.start()
+            self.threads.append(t)
+
+    def stop(self):
+        """Finish queued jobs, then stop the workers"""
+        for _ in self.threads:
+            self.jobs.put(None)
+        for t in self.threads:
+            t.join()
+        self.threads = []
+
+    def submit_version(self, version: str) -> VersionJobs:
+        urls = self.engine.discover_download_urls(version)
+        tracker = VersionJobs(version, len(urls))
+        for url, arch, fname in urls:
+            self.jobs.put((url, version, arch, fname, tracker))
+            self.stats.add('queued')
+        return tracker
+
+    def join(self):
+        """Block until every queued job has been processed"""
+        self.jobs.join()
+
+    def _worker(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                self.jobs.task_done()
+                return
+            url, version, arch, fname, tracker = job
+            try:
+                if not self.engine.stop_requested():
+                    ok = self.engine.download_file(url, version, arch, fname)
+                    self.stats.add('done')
+                    self.stats.add('ok' if ok else 'missing')
+            except Exception:
+                self.stats.add('done')
+            finally:
+                tracker.finish_one()
+                self.jobs.task_done()
+
 
 class MasterEngine:
-    def __init__(self, output_dir: str, download_workers: int = 8, max_retries: int = 3, gui=None):
+    def __init__(self, output_dir: str, download_workers: int = 8, max_retries: int = 3, gui=None,
+                 probe_concurrency: int = PROBE_CONCURRENCY, probe_rps: float = PROBE_RPS,
+                 download_queue_size: int = DOWNLOAD_QUEUE_SIZE, url_discovery: str = 'auto'):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.download_workers = max(1, int(download_workers))
         self.max_retries = max_retries
         self.gui = gui
+        self.probe_concurrency = probe_concurrency
+        self.probe_rps = probe_rps
+        if url_discovery not in URL_DISCOVERY_MODES:
+            raise ValueError(f"url_discovery must be one of {', '.join(URL_DISCOVERY_MODES)}")
+        self.url_discovery = url_discovery
+        self.index_misses = 0
+        # one request budget for every probe, sync or async
+        self.limiter = RateLimiter(probe_rps)
+        # (loop, prober) of a running discovery, reused for file HEADs
+        self.active_prober = None
 
         self.session = requests.Session()
         self.session.headers.update({'User-Agent': 'MikroTikScraper/1.0'})
+        # one pooled connection per download worker (plus probes)
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.download_workers + 16)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # scan -> download pipeline: probe stats, shared download workers
+        self.probe_stats = StageStats('probe')
+        self.downloads = DownloadPool(self, self.download_workers, download_queue_size)
 
         self.version_exists_cache = {}
         self.found_versions = set()
@@ -71,9 +486,12 @@ class MasterEngine:
         # persistent files
         self.versions_file = self.output_dir / 'found_versions.json'
         self.stats_file = self.output_dir / 'download_stats.json'
+        self.probe_cache = ProbeCache(self.output_dir / 'probe_cache.jsonl')
 
         # load persisted if available
         self._load_persisted()
+        for v in self.found_versions:
+            self.probe_cache.note_found(v)
 
     def _load_persisted(self):
         if self.versions_file.exists():
@@ -101,7 +519,11 @@ class MasterEngine:
             with self.gui.stats_lock:
                 self.gui.stats[key] = value
 
+    def stop_requested(self) -> bool:
+        return bool(getattr(self.gui, 'stop_requested', False))
+
     def generate_all_version_numbers(self, start_major: int, start_minor: int, end_major: int, end_minor: int):
+        """Brute-force candidate list (kept for reference; see discover_versions)"""
         versions = []
         for major in range(start_major, end_major + 1):
             min_minor = start_minor if major == start_major else 0
@@ -117,25 +539,161 @@ class MasterEngine:
                         versions.append(f"{base}.{patch}beta{beta}")
         return versions
 
-    def check_version_exists(self, version: str) -> bool:
+    def cached_probe(self, version: str):
+        """Known result from this run or the on-disk cache, else None"""
         if version in self.version_exists_cache:
             return self.version_exists_cache[version]
+        cached = self.probe_cache.get(version)
+        if cached is not None:
+            self.version_exists_cache[version] = cached
+        return cached
+
+    def record_probe(self, version: str, exists: bool):
+        self.version_exists_cache[version] = exists
+        self.probe_cache.put(version, exists)
 
+    def check_version_exists(self, version: str) -> bool:
+        cached = self.cached_probe(version)
+        if cached is not None:
+            return cached
+
+        self.increment_stat('versions_tested')
+        self.probe_stats.add('probed')
         test_url = f"{BASE_CDN_URL}/{version}/"
         try:
+            self.limiter.wait()
             resp = self.session.head(test_url, timeout=8, allow_redirects=True)
             exists = resp.status_code in (200, 301, 302, 403)
             if not exists:
                 # try known file
                 changelog = f"{BASE_CDN_URL}/{version}/CHANGELOG"
+                self.limiter.wait()
                 resp = self.session.head(changelog, timeout=8)
                 exists = resp.status_code == 200
-            self.version_exists_cache[version] = exists
+            self.record_probe(version, exists)
             return exists
         except Exception:
+            # network errors are not persisted; the next run retries
             self.version_exists_cache[version] = False
             return False
 
+    async def _walk_series(self, check, first, last, miss_limit):
+        """Numbers n >= first for which ``await check(n)`` is true.
+
+        Numbers are checked in concurrent windows of ``miss_limit``; the
+        series ends after ``miss_limit`` consecutive misses, so it costs at
+        most one extra window past its last release.
+        """
+        hits = []
+        misses = 0
+        n = first
+        while n <= last and misses < miss_limit:
+            window = range(n, min(n + miss_limit, last + 1))
+            results = await asyncio.gather(*(check(i) for i in window))
+            for i, exists in zip(window, results):
+                if exists:
+                    hits.append(i)
+                    misses = 0
+                else:
+                    misses += 1
+                    if misses >= miss_limit:
+                        break
+            n += len(window)
+        return hits
+
+    def discover_versions(self, start_version: str, end_version: str, test_workers: int = 12,
+                          miss_limit: int = DISCOVERY_MISS_LIMIT, on_found=None):
+        """Find existing RouterOS versions using the structure of version numbers.
+
+        1. Seeds: versions already in found_versions.json and the RSS feed.
+        2. For each major, probe X.Y (plus X.Yrc1 / X.Ybeta1 for minors
+           only published as pre-releases) until ``miss_limit`` minors in
+           a row are missing.
+        3. Under each minor that exists, walk X.Y.Z, X.YrcN and X.YbetaN,
+           each stopping after consecutive misses.
+
+        All series run concurrently on an AsyncProber; ``test_workers`` is
+        only used by its thread fallback. ``on_found(version)`` is called
+        (in a worker thread) for each version as soon as it is confirmed.
+        Returns the sorted list of versions that exist.
+        """
+        return asyncio.run(self._discover(start_version, end_version, test_workers, miss_limit, on_found))
+
+    async def _discover(self, start_version, end_version, test_workers, miss_limit, on_found):
+        start = parse_version(start_version if start_version.count('.') else f"{start_version}.0")
+        end = parse_version(end_version if end_version.count('.') else f"{end_version}.99")
+        start_major, start_minor = start[0], start[1]
+        end_major, end_minor = end[0], end[1]
+
+        def in_range(major, minor):
+            return (start_major, start_minor) <= (major, minor) <= (end_major, end_minor)
+
+        known = set(self.found_versions)
+        loop = asyncio.get_running_loop()
+        known.update(await loop.run_in_executor(None, self.fetch_rss_versions))
+        known = {v for v in known if parse_version(v) and in_range(*parse_version(v)[:2])}
+        seeded_minors = {parse_version(v)[:2] for v in known}
+        self.log(f"Discovery seeded with {len(known)} known versions", 'INFO')
+
+        found = set()
+
+        async def confirm(version):
+            if version in found:
+                return
+            found.add(version)
+            if on_found:
+                await loop.run_in_executor(None, on_found, version)
+
+        async with AsyncProber(self, self.probe_concurrency, fallback_workers=test_workers) as prober:
+            self.log(f"Probe engine: {prober.mode}, {self.probe_rps} req/s limit", 'INFO')
+            self.active_prober = (asyncio.get_running_loop(), prober)
+            try:
+                async def exists(version):
+                    if version in known or await prober.exists(version):
+                        await confirm(version)
+                        return True
+                    return False
+
+                async def minor_exists(major, minor):
+                    if (major, minor) in seeded_minors:
+                        return True
+                    for v in (f"{major}.{minor}", f"{major}.{minor}rc1", f"{major}.{minor}beta1"):
+                        if await exists(v):
+                            return True
+                    return False
+
+                async def scan_major(major):
+                    first = start_minor if major == start_major else 0
+                    last = end_minor if major == end_major else 99
+                    hits = await self._walk_series(lambda minor: minor_exists(major, minor), first, last, miss_limit)
+                    # seeds past a gap in the minor numbers still count
+                    return {(major, minor) for minor in hits} | {m for m in seeded_minors if m[0] == major}
+
+                minors = set()
+                for result in await asyncio.gather(*(scan_major(m) for m in range(start_major, end_major + 1))):
+                    minors |= result
+                self.log(f"Discovery: {len(minors)} minor releases exist", 'INFO')
+
+                series = []
+                for major, minor in sorted(minors):
+                    base = f"{major}.{minor}"
+                    # number 0 is the x.y release itself
+                    series.append(self._walk_series(lambda i, b=base: exists(f"{b}.{i}" if i else b), 0, 99, miss_limit))
+                    series.append(self._walk_series(lambda i, b=base: exists(f"{b}rc{i}"), 1, 99, PRERELEASE_MISS_LIMIT))
+                    series.append(self._walk_series(lambda i, b=base: exists(f"{b}beta{i}"), 1, 99, PRERELEASE_MISS_LIMIT))
+                for result in await asyncio.gather(*series, return_exceptions=True):
+                    if isinstance(result, Exception):
+                        self.log(f"Discovery series failed: {result}", 'WARNING')
+
+                # seeds the series walks never reached
+                for version in sorted(known - found, key=version_key):
+                    await confirm(version)
+            finally:
+                self.active_prober = None
+
+        self.log(f"Discovery found {len(found)} versions", 'SUCCESS')
+        return sorted(found, key=version_key)
+
     def build_download_urls(self, version: str):
         urls = []
         for arch in ARCHITECTURES:
@@ -155,6 +713,104 @@ class MasterEngine:
                 urls.append((url, arch, filename))
         return urls
 
+    def fetch_version_index(self, version: str):
+        """Filenames published for a version, or None without a usable index.
+
+        Tries the directory listing, then each of INDEX_FILES; usually the
+        first request answers it.
+        """
+        base = f"{BASE_CDN_URL}/{version}/"
+        for url in [base] + [base + name for name in INDEX_FILES]:
+            self.downloads.stats.add('index_requests')
+            try:
+                self.limiter.wait()
+                resp = self.session.get(url, timeout=15)
+            except Exception:
+                continue
+            if resp.status_code != 200:
+                continue
+            names = parse_file_index(resp.text)
+            if names:
+                return names
+        return None
+
+    def head_ok(self, url: str) -> bool:
+        try:
+            self.limiter.wait()
+            return self.session.head(url, timeout=8, allow_redirects=True).status_code == 200
+        except Exception:
+            return False
+
+    def discover_download_urls(self, version: str):
+        """Download URLs that actually exist for a version.
+
+        ``url_discovery`` modes:
+          auto  - download what the version index lists (FILE_PATTERNS
+                  candidates plus any other file naming the version);
+                  without an index, fall back to HEAD probing
+          head  - HEAD every candidate in parallel, keep the 200s
+          guess - every candidate (each miss costs a GET)
+        Candidates already on disk are kept without a request;
+        download_file skips them.
+        """
+        candidates = self.build_download_urls(version)
+        if self.url_discovery == 'guess':
+            return candidates
+
+        if self.url_discovery == 'auto' and self.index_misses < INDEX_MISS_LIMIT:
+            names = self.fetch_version_index(version)
+            with self.lock:
+                self.index_misses = 0 if names is not None else self.index_misses + 1
+                if self.index_misses == INDEX_MISS_LIMIT:
+                    self.log("No version index on the CDN; using HEAD probing from now on", 'WARNING')
+            if names is not None:
+                urls = [c for c in candidates if c[2] in names]
+                known = {c[2] for c in urls}
+                # Release files the patterns don't guess (e.g. v7's
+                # routeros-7.16-arm64.npk) still carry the version
+                extra = sorted(n for n in names - known if version in n)
+                urls += [(f"{BASE_CDN_URL}/{version}/{n}", file_arch(n), n) for n in extra]
+                ignored = sorted(names - known - set(extra))
+                if ignored:
+                    self.log(f"{version}: index entries ignored: {', '.join(ignored[:10])}"
+                             f"{' ...' if len(ignored) > 10 else ''}", 'INFO')
+                if urls:
+                    self.log(f"{version}: index lists {len(urls)} files "
+                             f"({len(urls) - len(extra)} of {len(candidates)} candidates)", 'INFO')
+                    return urls
+                # a page listing no release files (e.g. a landing page):
+                # the files may still exist, so probe for them
+
+        on_disk = [c for c in candidates if (self.output_dir / version / c[1] / c[2]).exists()]
+        to_probe = [c for c in candidates if c not in on_disk]
+        urls = on_disk + self.probe_download_urls(to_probe)
+        self.log(f"{version}: HEAD probing found {len(urls) - len(on_disk)} of {len(to_probe)} files", 'INFO')
+        return urls
+
+    def probe_download_urls(self, candidates):
+        """Candidates whose URL answers a HEAD with 200.
+
+        During a scan the HEADs go to the discovery loop's prober, sharing
+        its connections; otherwise a short-lived prober is used. Either
+        way they count against the engine's one rate limit.
+        """
+        if not candidates:
+            return []
+        self.downloads.stats.add('head_requests', len(candidates))
+        active = self.active_prober
+        if active is not None:
+            loop, prober = active
+            futures = [asyncio.run_coroutine_threadsafe(prober.url_exists(url), loop)
+                       for url, _, _ in candidates]
+            results = [f.result() for f in futures]
+        else:
+            results = asyncio.run(self._probe_urls(candidates))
+        return [c for c, ok in zip(candidates, results) if ok]
+
+    async def _probe_urls(self, candidates):
+        async with AsyncProber(self, self.probe_concurrency, fallback_workers=self.download_workers) as prober:
+            return await asyncio.gather(*(prober.url_exists(url) for url, _, _ in candidates))
+
     def download_file(self, url: str, version: str, arch: str, filename: str, retry_count: int = 0) -> bool:
         out_path = self.output_dir / version / arch / filename
         try:
@@ -178,6 +834,7 @@ class MasterEngine:
 
             self.increment_stat('files_downloaded')
             self.increment_stat('bytes_downloaded', downloaded)
+            self.downloads.stats.add('bytes', downloaded)
             self.log(f"[DOWNLOAD] {filename} ({downloaded / 1024 / 1024:.2f} MB)", 'SUCCESS')
             return True
         except Exception as e:
@@ -197,8 +854,15 @@ class MasterEngine:
                     pass
                 return False
 
-    def process_version(self, version: str):
-        if not self.check_version_exists(version):
+    def process_version(self, version: str, wait: bool = True, confirmed: bool = False):
+        """Queue all files of an existing version on the download pool.
+
+        With ``wait`` the call returns once they are all handled; the scan
+        pipeline passes False and lets the bounded queue pace it. It also
+        passes ``confirmed`` for versions discovery already established
+        (including seeds), which skips the existence probe.
+        """
+        if not confirmed and not self.check_version_exists(version):
             return 0
 
         self.log(f"{'='*60}", 'INFO')
@@ -210,15 +874,12 @@ class MasterEngine:
 
         self.increment_stat('versions_found')
         self.update_stat('current_version', version)
+        self.probe_stats.add('found')
 
-        urls = self.build_download_urls(version)
-        with ThreadPoolExecutor(max_workers=self.download_workers) as ex:
-            futures = {ex.submit(self.download_file, url, version, arch, fname): fname for url, arch, fname in urls}
-            for fut in as_completed(futures):
-                try:
-                    fut.result()
-                except Exception:
-                    pass
+        self.downloads.start()
+        tracker = self.downloads.submit_version(version)
+        if wait:
+            tracker.wait()
 
         return 1
 
@@ -240,57 +901,67 @@ class MasterEngine:
             self.log(f"Failed to save stats: {e}", 'WARNING')
 
     def scan_versions_range_and_download(self, start_version: str, end_version: str, test_workers: int = 12):
-        start_parts = start_version.split('.')
-        end_parts = end_version.split('.')
-        start_major = int(start_parts[0])
-        start_minor = int(start_parts[1]) if len(start_parts) > 1 else 0
-        end_major = int(end_parts[0])
-        end_minor = int(end_parts[1]) if len(end_parts) > 1 else 50
-
-        all_versions = self.generate_all_version_numbers(start_major, start_minor, end_major, end_minor)
-        self.log(f"Generated {len(all_versions)} candidate versions", 'INFO')
-
-        existing = []
-        with ThreadPoolExecutor(max_workers=test_workers) as ex:
-            futures = {ex.submit(self.check_version_exists, v): v for v in all_versions}
-            for fut in as_completed(futures):
-                v = futures[fut]
-                try:
-                    self.increment_stat('versions_tested')
-                    if fut.result():
-                        existing.append(v)
-                        self.log(f"Found version: {v}", 'FOUND')
-                except Exception:
-                    pass
-
-        self.log(f"Found {len(existing)} versions in scan", 'SUCCESS')
-        # persist
-        with self.lock:
-            self.found_versions.update(existing)
-        self.save_found_versions()
-
-        # download each
-        for i, v in enumerate(sorted(existing), 1):
-            if self.gui and self.gui.stop_requested:
-                self.log("Stop requested; aborting downloads", 'WARNING')
-                break
-            self.log(f"Processing [{i}/{len(existing)}] {v}", 'INFO')
-            self.process_version(v)
-
-        self.save_stats()
+        """Two-stage pipeline: discovery feeds the shared download pool.
+
+        Each version is queued for download as soon as its probe confirms
+        it. Probe concurrency/rate and download workers are limited
+        separately; a full download queue blocks the probe stage.
+        Returns the number of versions found.
+        """
+        self.probe_stats = StageStats('probe')
+        self.downloads.stats = StageStats('download')
+        self.downloads.start()
+        reporter_stop = threading.Event()
+        reporter = threading.Thread(target=self._report_pipeline, args=(reporter_stop,), daemon=True)
+        reporter.start()
+
+        def on_found(version):
+            if self.stop_requested():
+                return
+            self.process_version(version, wait=False, confirmed=True)
 
-    def scan_rss_for_versions(self):
+        try:
+            existing = self.discover_versions(start_version, end_version, test_workers=test_workers,
+                                              on_found=on_found)
+            self.log(f"Found {len(existing)} versions in scan; waiting for downloads", 'SUCCESS')
+            self.save_found_versions()
+            self.downloads.join()
+        finally:
+            reporter_stop.set()
+            reporter.join()
+            self.log_pipeline_stats()
+            self.save_stats()
+        return len(existing)
+
+    def log_pipeline_stats(self):
+        probe, dl = self.probe_stats, self.downloads.stats
+        self.log(f"[PROBE] {probe.get('probed')} probes ({probe.rate('probed'):.1f}/s), "
+                 f"{probe.get('found')} versions found", 'INFO')
+        self.log(f"[DOWNLOAD] {dl.get('done')}/{dl.get('queued')} files ({dl.rate('done'):.1f}/s, "
+                 f"{dl.rate('bytes') / 1024 / 1024:.2f} MB/s), queue {self.downloads.jobs.qsize()}/"
+                 f"{self.downloads.jobs.maxsize}, {dl.get('missing')} missing, "
+                 f"{dl.get('index_requests')} index + {dl.get('head_requests')} HEAD requests", 'INFO')
+
+    def _report_pipeline(self, stop_event):
+        while not stop_event.wait(STATS_INTERVAL):
+            self.log_pipeline_stats()
+
+    def fetch_rss_versions(self):
+        """All versions mentioned in the RSS feed (empty set on error)"""
         try:
             r = self.session.get(RSS_URL, timeout=10)
             # simple regex to extract versions like 7.16.2 or 7.16rc1
-            vers = set(re.findall(r'RouterOS v?(\d+\.\d+(?:\.\d+)?(?:rc\d+)?(?:beta\d+)?)', r.text))
-            new = [v for v in vers if v not in self.found_versions]
-            for v in new:
-                self.log(f"RSS discovered new version: {v}", 'FOUND')
-            return new
+            return set(re.findall(r'RouterOS v?(\d+\.\d+(?:\.\d+)?(?:rc\d+)?(?:beta\d+)?)', r.text))
         except Exception as e:
             self.log(f"RSS check failed: {e}", 'WARNING')
-            return []
+            return set()
+
+    def scan_rss_for_versions(self):
+        vers = self.fetch_rss_versions()
+        new = [v for v in vers if v not in self.found_versions]
+        for v in new:
+            self.log(f"RSS discovered new version: {v}", 'FOUND')
+        return new
 
 
 class MasterGUI:
@@ -21,6 +21,7 @@ fi
 # Install dependencies
 echo -e "${BLUE}Installing dependencies...${NC}"
 pip3 install requests --user
+pip3 install 'httpx[http2]' --user || echo "httpx not installed; version probing will use threads"
 
 # Set paths
 INSTALL_DIR="${1:-.}"